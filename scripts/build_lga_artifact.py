@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 import geopandas as gpd
+import shapely
 
 GPKG_PATH = Path("data/ASGS_Ed3_Non_ABS_Structures_GDA2020_updated_2025.gpkg")
 LGA_LAYER = "LGA_2025_AUST_GDA2020"
@@ -9,6 +11,10 @@ LGA_NAME_COL = "LGA_NAME_2025"
 STATE_NAME_COL = "STATE_NAME_2021"
 
 OUT_PATH = Path("data/lga_2025_simplified.geojson")
+PARQUET_OUT_PATH = Path("data/lga_2025_simplified.parquet")
+
+# Douglas–Peucker tolerance in degrees (~0.001 ≈ 100 m)
+DEFAULT_TOLERANCE = 0.001
 
 STATE_MAP = {
     "Victoria": "VIC",
@@ -21,27 +27,71 @@ STATE_MAP = {
     "Australian Capital Territory": "ACT",
 }
 
+
+def _vertex_count(gdf: gpd.GeoDataFrame) -> int:
+    return int(shapely.get_num_coordinates(gdf.geometry.values).sum())
+
+
+def _simplify_shared_edges(gdf: gpd.GeoDataFrame, tolerance: float) -> gpd.GeoDataFrame:
+    """
+    Simplify via a TopoJSON topology so neighbouring LGAs share simplified
+    edges (no slivers/gaps along borders). Requires the optional `topojson` package.
+    """
+    import topojson  # optional dependency, only needed for --topojson
+
+    topo = topojson.Topology(gdf, prequantize=True)
+    out = topo.toposimplify(tolerance).to_gdf()
+    return out.set_crs(gdf.crs, allow_override=True)
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the simplified LGA polygon artifact.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Simplification tolerance in degrees (default: {DEFAULT_TOLERANCE}).",
+    )
+    parser.add_argument(
+        "--topojson",
+        action="store_true",
+        help="Simplify shared borders consistently via the topojson package.",
+    )
+    args = parser.parse_args()
+
     gdf = gpd.read_file(GPKG_PATH, layer=LGA_LAYER)
 
     gdf = gdf[[STATE_NAME_COL, LGA_NAME_COL, "geometry"]].copy()
     gdf["state"] = gdf[STATE_NAME_COL].map(STATE_MAP).fillna(gdf[STATE_NAME_COL])
 
     gdf = gdf.to_crs("EPSG:4326")
+    vertices_before = _vertex_count(gdf)
+
+    if args.topojson:
+        gdf = _simplify_shared_edges(gdf, args.tolerance)
+    else:
+        gdf["geometry"] = gdf["geometry"].simplify(
+            tolerance=args.tolerance,
+            preserve_topology=True
+        )
 
-    # simplify geometries (tune tolerance later if needed)
-    gdf["geometry"] = gdf["geometry"].simplify(
-        tolerance=0.001,
-        preserve_topology=True
+    print(
+        f"Simplified at tolerance={args.tolerance}: "
+        f"{vertices_before} -> {_vertex_count(gdf)} vertices"
     )
 
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    gdf[["state", LGA_NAME_COL, "geometry"]].to_file(
+    out = gdf[["state", LGA_NAME_COL, "geometry"]]
+    out.to_file(
         OUT_PATH,
         driver="GeoJSON"
     )
 
     print(f"Wrote {OUT_PATH} ({len(gdf)} LGAs)")
 
+    # GeoParquet copy for fast app startup (lga_lookup prefers it when present)
+    out.to_parquet(PARQUET_OUT_PATH)
+    print(f"Wrote {PARQUET_OUT_PATH}")
+
 if __name__ == "__main__":
     main()
@@ -1,78 +1,230 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
 import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
 DB_PATH = Path("cache/geocode_cache.db")
 
+# Rows older than this are treated as misses and re-geocoded (None = never expire).
+# Google's terms allow caching geocoded coordinates for up to 30 days.
+CACHE_TTL_DAYS: Optional[int] = 30
 
-def _connect() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS geocode_cache (
-            cache_key TEXT PRIMARY KEY,
-            formatted_address TEXT,
-            lat REAL,
-            lon REAL,
-            state TEXT,
-            postcode TEXT,
-            locality TEXT,
-            created_at TEXT DEFAULT (datetime('now'))
+
+# One connection per thread (Streamlit serves sessions from worker threads);
+# connections stay open for the life of the thread instead of per call, and are
+# closed when the thread exits (or by close_connections()).
+_LOCAL = threading.local()
+_OPEN_CONNECTIONS: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+_SCHEMA_LOCK = threading.Lock()
+# Resolved DB paths whose schema/migrations have been checked in this process
+_SCHEMA_READY: set[Path] = set()
+
+# In-process LRU in front of SQLite so repeat lookups skip the query entirely.
+# OrderedDict (rather than functools.lru_cache) so single keys can be invalidated.
+# Entries keep the row's created_at (epoch seconds) so CACHE_TTL_DAYS applies here too.
+MEMO_MAXSIZE = 4096
+_MEMO: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+
+
+def _is_expired(created_at: float) -> bool:
+    return CACHE_TTL_DAYS is not None and time.time() - created_at >= CACHE_TTL_DAYS * 86400
+
+
+def _memo_get(cache_key: str) -> Optional[dict]:
+    with _MEMO_LOCK:
+        entry = _MEMO.get(cache_key)
+        if entry is None:
+            return None
+        created_at, geo = entry
+        if _is_expired(created_at):
+            del _MEMO[cache_key]
+            return None
+        _MEMO.move_to_end(cache_key)
+        return dict(geo)
+
+
+def _memo_put(cache_key: str, geo: dict, created_at: float) -> None:
+    with _MEMO_LOCK:
+        _MEMO[cache_key] = (created_at, dict(geo))
+        _MEMO.move_to_end(cache_key)
+        while len(_MEMO) > MEMO_MAXSIZE:
+            _MEMO.popitem(last=False)
+
+
+def _memo_discard(cache_key: str | None = None) -> None:
+    """Drop one key from the in-process LRU, or everything when key is None."""
+    with _MEMO_LOCK:
+        if cache_key is None:
+            _MEMO.clear()
+        else:
+            _MEMO.pop(cache_key, None)
+
+
+def _ensure_schema(conn: sqlite3.Connection, db_path: Path) -> None:
+    with _SCHEMA_LOCK:
+        if db_path in _SCHEMA_READY:
+            return
+
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                cache_key BLOB PRIMARY KEY,
+                raw_key TEXT,
+                formatted_address TEXT,
+                lat REAL,
+                lon REAL,
+                state TEXT,
+                postcode TEXT,
+                locality TEXT,
+                created_at TEXT DEFAULT (datetime('now'))
+            )
+            """
         )
-        """
-    )
 
-    # Migration: add locality column if DB already exists
-    try:
-        conn.execute("ALTER TABLE geocode_cache ADD COLUMN locality TEXT")
-    except sqlite3.OperationalError:
-        pass  # column already exists
+        # Migration: add locality column if DB already exists
+        try:
+            conn.execute("ALTER TABLE geocode_cache ADD COLUMN locality TEXT")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+
+        try:
+            conn.execute("ALTER TABLE geocode_cache ADD COLUMN raw_key TEXT")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+
+        # Migration: keys are now BLAKE2b digests. Legacy rows are keyed by the
+        # plain normalised key, so re-key them in place (keeping the paid-for
+        # geocodes); a legacy row whose digest is already cached is dropped.
+        legacy = conn.execute(
+            "SELECT cache_key FROM geocode_cache WHERE typeof(cache_key) = 'text'"
+        ).fetchall()
+        for (raw_key,) in legacy:
+            try:
+                conn.execute(
+                    "UPDATE geocode_cache SET raw_key = cache_key, cache_key = ? WHERE cache_key = ?",
+                    (_digest(raw_key), raw_key),
+                )
+            except sqlite3.IntegrityError:
+                conn.execute("DELETE FROM geocode_cache WHERE cache_key = ?", (raw_key,))
+
+        conn.commit()
+        _SCHEMA_READY.add(db_path)
+
+
+class _ThreadConnection:
+    """A thread's pooled connection; closed when the owning thread's locals are dropped."""
 
+    def __init__(self, db_path: Path, conn: sqlite3.Connection):
+        self.db_path = db_path
+        self.conn: Optional[sqlite3.Connection] = conn
+
+    def close(self) -> None:
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            conn.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+def _connect() -> sqlite3.Connection:
+    db_path = DB_PATH.resolve()
+    held = getattr(_LOCAL, "held", None)
+    if held is not None and held.conn is not None and held.db_path == db_path:
+        return held.conn
+    if held is not None:
+        held.close()  # DB_PATH changed since this thread connected
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # Only the owning thread uses it; check_same_thread=False just lets
+    # close_connections() close it from another thread.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    _ensure_schema(conn, db_path)
+
+    held = _LOCAL.held = _ThreadConnection(db_path, conn)
+    _OPEN_CONNECTIONS.add(held)
     return conn
 
 
+@atexit.register
+def close_connections() -> None:
+    """Close every pooled connection (threads reconnect on their next call)."""
+    for held in list(_OPEN_CONNECTIONS):
+        held.close()
+
+
+def _digest(cache_key: str) -> bytes:
+    """Fixed-width 16-byte primary key for a (normalised) cache key."""
+    return hashlib.blake2b(cache_key.encode("utf-8"), digest_size=16).digest()
+
 
 def get_cached(cache_key: str) -> Optional[dict]:
+    memo = _memo_get(cache_key)
+    if memo is not None:
+        return memo
+
     conn = _connect()
-    try:
+    if CACHE_TTL_DAYS is None:
         cur = conn.execute(
             """
-            SELECT formatted_address, lat, lon, state, postcode, locality
+            SELECT formatted_address, lat, lon, state, postcode, locality,
+                   CAST(strftime('%s', created_at) AS REAL)
             FROM geocode_cache
             WHERE cache_key = ?
             """,
-            (cache_key,),
+            (_digest(cache_key),),
+        )
+    else:
+        cur = conn.execute(
+            """
+            SELECT formatted_address, lat, lon, state, postcode, locality,
+                   CAST(strftime('%s', created_at) AS REAL)
+            FROM geocode_cache
+            WHERE cache_key = ? AND created_at >= datetime('now', ?)
+            """,
+            (_digest(cache_key), f"-{CACHE_TTL_DAYS} days"),
         )
 
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "formatted_address": row[0],
-            "lat": row[1],
-            "lon": row[2],
-            "state": row[3],
-            "postcode": row[4],
-            "locality": row[5],
-        }
-    finally:
-        conn.close()
+    row = cur.fetchone()
+    if not row:
+        return None
+    geo = {
+        "formatted_address": row[0],
+        "lat": row[1],
+        "lon": row[2],
+        "state": row[3],
+        "postcode": row[4],
+        "locality": row[5],
+    }
+    # A row without created_at can't be aged, so it isn't kept in memory
+    if row[6] is not None:
+        _memo_put(cache_key, geo, row[6])
+    return dict(geo)
 
 
 def set_cached(cache_key: str, geo: dict) -> None:
-    conn = _connect()
-    try:
+    # `with conn` commits (or rolls back) but leaves the pooled connection open
+    with _connect() as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO geocode_cache
-            (cache_key, formatted_address, lat, lon, state, postcode, locality)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (cache_key, raw_key, formatted_address, lat, lon, state, postcode, locality)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
+                _digest(cache_key),
                 cache_key,
                 geo.get("formatted_address"),
                 geo.get("lat"),
@@ -82,28 +234,20 @@ def set_cached(cache_key: str, geo: dict) -> None:
                 geo.get("locality"),
             ),
         )
-
-        conn.commit()
-    finally:
-        conn.close()
+    # Stored row only keeps the cached columns; let the next read repopulate the LRU.
+    _memo_discard(cache_key)
 
 def clear_cache() -> int:
     """Delete all cached geocodes. Returns number of rows deleted."""
-    conn = _connect()
-    try:
+    with _connect() as conn:
         cur = conn.execute("DELETE FROM geocode_cache")
-        conn.commit()
-        return cur.rowcount or 0
-    finally:
-        conn.close()
+    _memo_discard()
+    return cur.rowcount or 0
 
 
 def delete_cache_key(cache_key: str) -> int:
     """Delete a single cache entry by key. Returns 1 if deleted, else 0."""
-    conn = _connect()
-    try:
-        cur = conn.execute("DELETE FROM geocode_cache WHERE cache_key = ?", (cache_key,))
-        conn.commit()
-        return cur.rowcount or 0
-    finally:
-        conn.close()
+    with _connect() as conn:
+        cur = conn.execute("DELETE FROM geocode_cache WHERE cache_key = ?", (_digest(cache_key),))
+    _memo_discard(cache_key)
+    return cur.rowcount or 0
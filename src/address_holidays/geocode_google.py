@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import os
 import re
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 from dotenv import load_dotenv, find_dotenv
 
 from .geocode_cache import get_cached, set_cached
+from .http_session import SESSION, parse_json
 
 STATE_MAP = {
     "Victoria": "VIC",
@@ -25,6 +29,50 @@ GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
 CACHE_VERSION = "v3"
 
+# Client-side rate limit for Google requests (cache hits are not throttled)
+GEOCODE_MAX_QPS = 10
+GEOCODE_MAX_WORKERS = 8
+
+_LEADING_NUM_RE = re.compile(r"^\s*\d+\s+")
+_STREET_SUFFIX_RE = re.compile(
+    r"\b(st|street|rd|road|ave|avenue|blvd|boulevard|dr|drive|ct|court|ln|lane|pde|parade)\b\.?",
+    re.I,
+)
+
+# Mirrors the original space-padded token scan: short abbreviations need a space
+# (or string edge) on both sides, full words only a leading one.
+_STREET_TOKEN_RE = re.compile(
+    r"(?<![^ ])(?:street|road|avenue|boulevard|blvd|lane|drive|court|parade|pde"
+    r"|(?:st|rd|ave|ln|dr|ct)(?![^ ]))",
+    re.I,
+)
+_HAS_DIGIT_RE = re.compile(r"\d")
+
+# Google result types used by _is_street_level_result
+_STREET_LEVEL_TYPES = frozenset({"street_address", "premise", "subpremise"})
+_AREA_LEVEL_TYPES = frozenset({
+    "postal_code",
+    "locality",
+    "administrative_area_level_1",
+    "administrative_area_level_2",
+})
+
+_THROTTLE_LOCK = threading.Lock()
+_NEXT_REQUEST_AT = 0.0
+
+
+def _throttle() -> None:
+    """Space outgoing Google requests at least 1/GEOCODE_MAX_QPS seconds apart."""
+    global _NEXT_REQUEST_AT
+
+    with _THROTTLE_LOCK:
+        now = time.monotonic()
+        wait = _NEXT_REQUEST_AT - now
+        _NEXT_REQUEST_AT = max(now, _NEXT_REQUEST_AT) + 1.0 / GEOCODE_MAX_QPS
+
+    if wait > 0:
+        time.sleep(wait)
+
 
 def _simplify_address_for_fallback(address: str) -> tuple[str, str]:
     """
@@ -39,13 +87,8 @@ def _simplify_address_for_fallback(address: str) -> tuple[str, str]:
         return simplified, "SUBURB"
 
     # Strip street number and street words
-    stripped = re.sub(r"^\s*\d+\s+", "", a)
-    stripped = re.sub(
-        r"\b(st|street|rd|road|ave|avenue|blvd|boulevard|dr|drive|ct|court|ln|lane|pde|parade)\b\.?",
-        "",
-        stripped,
-        flags=re.I,
-    ).strip()
+    stripped = _LEADING_NUM_RE.sub("", a)
+    stripped = _STREET_SUFFIX_RE.sub("", stripped).strip()
 
     # If we end up with something very short, it's likely state-level
     if len(stripped.split()) <= 2:
@@ -60,19 +103,7 @@ def _looks_like_street_address(query: str) -> bool:
     True if the user likely intended a street-level address.
     IMPORTANT: postcodes contain digits too, so digits alone isn't enough.
     """
-    q = f" {query.lower()} "
-
-    street_tokens = [
-        " street", " st ", " road", " rd ",
-        " avenue", " ave ", " boulevard", " blvd",
-        " lane", " ln ", " drive", " dr ",
-        " court", " ct ", " parade", " pde",
-    ]
-
-    has_street_word = any(tok in q for tok in street_tokens)
-    has_number = any(ch.isdigit() for ch in q)
-
-    return has_number and has_street_word
+    return bool(_HAS_DIGIT_RE.search(query) and _STREET_TOKEN_RE.search(query))
 
 
 def _is_street_level_result(result: dict) -> bool:
@@ -80,19 +111,14 @@ def _is_street_level_result(result: dict) -> bool:
     if result.get("partial_match") is True:
         return False
 
-    types = set(result.get("types", []))
+    types = result.get("types", [])
 
     # Strong street-level indicators
-    if types & {"street_address", "premise", "subpremise"}:
+    if not _STREET_LEVEL_TYPES.isdisjoint(types):
         return True
 
     # If it's only locality/postcode/admin-level, it's not street-level
-    if types & {
-        "postal_code",
-        "locality",
-        "administrative_area_level_1",
-        "administrative_area_level_2",
-    }:
+    if not _AREA_LEVEL_TYPES.isdisjoint(types):
         return False
 
     # Fallback: check address_components include BOTH route and street_number
@@ -103,72 +129,75 @@ def _is_street_level_result(result: dict) -> bool:
     return "route" in component_types and "street_number" in component_types
 
 
-def geocode_address(address: str) -> dict:
-    cache_key = f"{CACHE_VERSION}|" + " ".join(address.lower().split())
-
-
-    cached = get_cached(cache_key)
-    if cached:
-        return cached
+def _call_geocode(query: str, address: str) -> dict:
+    """Single Google Geocoding request; `address` is the original user input."""
+    params = {"address": query, "key": GOOGLE_MAPS_API_KEY}
+    _throttle()
+    resp = SESSION.get(GEOCODE_URL, params=params, timeout=20)
+    resp.raise_for_status()
+    data = parse_json(resp)
+    status = data.get("status")
 
-    def _call_geocode(query: str) -> dict:
-        params = {"address": query, "key": GOOGLE_MAPS_API_KEY}
-        resp = requests.get(GEOCODE_URL, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-        status = data.get("status")
+    if status == "ZERO_RESULTS":
+        raise ValueError(
+            "Address not found. Try adding suburb + state/postcode (e.g. 'Brunswick VIC 3056') "
+            "or check spelling."
+        )
 
-        if status == "ZERO_RESULTS":
-            raise ValueError(
-                "Address not found. Try adding suburb + state/postcode (e.g. 'Brunswick VIC 3056') "
-                "or check spelling."
-            )
+    if status != "OK":
+        raise ValueError(f"Geocoding failed: {status}")
 
-        if status != "OK":
-            raise ValueError(f"Geocoding failed: {status}")
+    result = data["results"][0]
 
-        result = data["results"][0]
+    # Only enforce street-level quality when the user intended a street-level address.
+    # Allow suburb/postcode-only queries to resolve (they'll be lower confidence downstream).
+    if _looks_like_street_address(query) and not _is_street_level_result(result):
+        raise ValueError(
+            "Address not found. Try adding suburb + state/postcode (e.g. 'Brunswick VIC 3056') "
+            "or check spelling."
+        )
 
-        # Only enforce street-level quality when the user intended a street-level address.
-        # Allow suburb/postcode-only queries to resolve (they'll be lower confidence downstream).
-        if _looks_like_street_address(query) and not _is_street_level_result(result):
-            raise ValueError(
-                "Address not found. Try adding suburb + state/postcode (e.g. 'Brunswick VIC 3056') "
-                "or check spelling."
-            )
+    location = result["geometry"]["location"]
 
-        location = result["geometry"]["location"]
+    components = {}
+    for c in result.get("address_components", []):
+        for t in c.get("types", []):
+            components[t] = c.get("long_name")
+
+    state = components.get("administrative_area_level_1")
+    postcode = components.get("postal_code")
+    locality = (
+        components.get("locality")
+        or components.get("postal_town")
+        or components.get("administrative_area_level_2")
+    )
+
+    state_code = STATE_MAP.get(state, state)
+
+    return {
+        "formatted_address": result.get("formatted_address"),
+        "lat": location.get("lat"),
+        "lon": location.get("lng"),
+        "state": state_code,
+        "postcode": postcode,
+        "locality": locality,
+        "geocode_query_used": query,
+        "is_fallback_match": query.strip() != address.strip(),
+        # Optional: pass through quality signal if you want it later
+        "location_type": result.get("geometry", {}).get("location_type"),
+    }
 
-        components = {}
-        for c in result.get("address_components", []):
-            for t in c.get("types", []):
-                components[t] = c.get("long_name")
 
-        state = components.get("administrative_area_level_1")
-        postcode = components.get("postal_code")
-        locality = (
-            components.get("locality")
-            or components.get("postal_town")
-            or components.get("administrative_area_level_2")
-        )
+def geocode_address(address: str) -> dict:
+    # Normalised once here; geocode_cache hashes it to a fixed-width key.
+    cache_key = f"{CACHE_VERSION}|" + " ".join(address.lower().split())
 
-        state_code = STATE_MAP.get(state, state)
-
-        return {
-            "formatted_address": result.get("formatted_address"),
-            "lat": location.get("lat"),
-            "lon": location.get("lng"),
-            "state": state_code,
-            "postcode": postcode,
-            "locality": locality,
-            "geocode_query_used": query,
-            "is_fallback_match": query.strip() != address.strip(),
-            # Optional: pass through quality signal if you want it later
-            "location_type": result.get("geometry", {}).get("location_type"),
-        }
+    cached = get_cached(cache_key)
+    if cached:
+        return cached
 
     try:
-        result_obj = _call_geocode(address)
+        result_obj = _call_geocode(address, address)
     except ValueError as e:
         # Only retry if the failure came from ZERO_RESULTS
         # (Street-level rejection should NOT auto-fallback silently)
@@ -184,10 +213,30 @@ def geocode_address(address: str) -> dict:
             )
 
         if fallback_query.strip() and fallback_query.strip() != address.strip():
-            result_obj = _call_geocode(fallback_query)
+            result_obj = _call_geocode(fallback_query, address)
         else:
             raise
 
 
     set_cached(cache_key, result_obj)
     return result_obj
+
+
+def geocode_addresses(
+    addresses: Iterable[str],
+    max_workers: int = GEOCODE_MAX_WORKERS,
+) -> list[dict | Exception]:
+    """
+    Geocode many addresses concurrently over the shared session.
+
+    Results are returned in input order. A failed lookup yields its exception in
+    place of the dict, so one bad address doesn't abort the whole batch.
+    """
+    def _one(address: str) -> dict | Exception:
+        try:
+            return geocode_address(address)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(_one, addresses))
@@ -5,32 +5,62 @@
 
 from __future__ import annotations
 
-import requests
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from .http_session import SESSION, parse_json
 
 
 NAGER_BASE = "https://date.nager.at/api/v3"
 
+# How long a fetched year is reused before Nager.Date is asked again, so a
+# long-running server picks up upstream corrections.
+HOLIDAYS_TTL_SECONDS = 24 * 60 * 60
+
 
-def get_au_public_holidays(year: int) -> list[dict]:
+def holidays_cache_bucket() -> int:
+    """
+    Current TTL window. Caches of anything derived from get_au_public_holidays()
+    should include it in their key so they roll over together with the fetch.
+    """
+    return int(time.time() // HOLIDAYS_TTL_SECONDS)
+
+
+def get_au_public_holidays(year: int) -> tuple[dict, ...]:
     """
     Return all Australian public holidays for the given year.
+
+    Fetched once per year per HOLIDAYS_TTL_SECONDS window per process. The
+    dicts are shared between callers, so copy before mutating.
     """
+    return _get_au_public_holidays_cached(year, holidays_cache_bucket())
+
+
+@functools.lru_cache(maxsize=8)
+def _get_au_public_holidays_cached(year: int, bucket: int) -> tuple[dict, ...]:
     url = f"{NAGER_BASE}/PublicHolidays/{year}/AU"
-    resp = requests.get(url, timeout=20)
+    resp = SESSION.get(url, timeout=20)
     resp.raise_for_status()
-    return resp.json()
+    return tuple(parse_json(resp))
 
 
-def filter_holidays_for_subdivision(holidays: list[dict], subdivision_code: str) -> list[dict]:
-    out = []
-    target = f"AU-{subdivision_code}"
-
-    for h in holidays:
-        counties = h.get("counties") or []
-        is_global = bool(h.get("global"))
+def get_au_public_holidays_many(years: Iterable[int]) -> dict[int, tuple[dict, ...]]:
+    """
+    Fetch several years concurrently (each year still hits the per-year cache).
+    """
+    unique_years = sorted(set(years))
+    if not unique_years:
+        return {}
 
-        if is_global or (target in counties):
-            out.append(h)
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_years))) as ex:
+        return dict(zip(unique_years, ex.map(get_au_public_holidays, unique_years)))
 
-    return out
 
+def filter_holidays_for_subdivision(holidays: Iterable[dict], subdivision_code: str) -> list[dict]:
+    target = f"AU-{subdivision_code}"
+    return [
+        h for h in holidays
+        if h.get("global") or target in (h.get("counties") or ())
+    ]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: ~3-5x faster JSON decoding
+except ImportError:  # pragma: no cover - fall back to stdlib json via requests
+    orjson = None
+
+# Kept connections per host; sized to the largest batch thread pool (run.py's
+# MAX_BATCH_WORKERS and the Streamlit batch) so busy workers don't have their
+# connections discarded and re-handshaked when the pool is full.
+POOL_MAXSIZE = 32
+
+# Shared session so repeated calls to Google / Nager.Date reuse TLS connections.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ),
+)
+
+
+def parse_json(resp: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
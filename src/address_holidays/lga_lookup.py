@@ -1,31 +1,58 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
+from typing import Sequence
 
 import geopandas as gpd
+import shapely
 from shapely.geometry import Point
+from shapely.strtree import STRtree
 
 ARTIFACT_PATH = Path("data/lga_2025_simplified.geojson")
+# Same artifact as GeoParquet (WKB geometry); much faster to load than GeoJSON.
+PARQUET_ARTIFACT_PATH = Path("data/lga_2025_simplified.parquet")
 LGA_NAME_COL = "LGA_NAME_2025"
+# State code column written by scripts/build_lga_artifact.py
+LGA_STATE_COL = "state"
 
-# Module-level cache so we only load once per app process
-_LGA_GDF: gpd.GeoDataFrame | None = None
+# Module-level cache so we only load once per app process: the polygons and the
+# spatial index over their geometry (positions match gdf row order), published
+# together as one tuple so concurrent lookups never see one without the other.
+_LGA_INDEX: tuple[gpd.GeoDataFrame, STRtree] | None = None
+_LGA_LOAD_LOCK = threading.Lock()
 
 
-def _load_lgas() -> gpd.GeoDataFrame:
+def _load_index() -> tuple[gpd.GeoDataFrame, STRtree]:
     """
-    Load AU LGA polygons (simplified artifact) once and keep them in memory.
+    Load AU LGA polygons (simplified artifact) and their STRtree once and keep
+    them in memory. Safe to call from the batch worker threads.
     """
-    global _LGA_GDF
+    global _LGA_INDEX
+
+    index = _LGA_INDEX
+    if index is not None:
+        return index
+
+    with _LGA_LOAD_LOCK:
+        if _LGA_INDEX is not None:
+            return _LGA_INDEX
+
+        gdf = None
+        if PARQUET_ARTIFACT_PATH.exists():
+            try:
+                gdf = gpd.read_parquet(PARQUET_ARTIFACT_PATH)
+            except ImportError:
+                gdf = None  # pyarrow not installed; fall back to GeoJSON
 
-    if _LGA_GDF is None:
-        if not ARTIFACT_PATH.exists():
-            raise FileNotFoundError(
-                f"Missing LGA artifact: {ARTIFACT_PATH}. "
-                f"Run scripts/build_lga_artifact.py to generate it."
-            )
+        if gdf is None:
+            if not ARTIFACT_PATH.exists():
+                raise FileNotFoundError(
+                    f"Missing LGA artifact: {ARTIFACT_PATH}. "
+                    f"Run scripts/build_lga_artifact.py to generate it."
+                )
 
-        gdf = gpd.read_file(ARTIFACT_PATH)
+            gdf = gpd.read_file(ARTIFACT_PATH)
 
         # Ensure WGS84 (lat/lon) for contains() checks
         if gdf.crs is None:
@@ -33,21 +60,91 @@ def _load_lgas() -> gpd.GeoDataFrame:
         else:
             gdf = gdf.to_crs("EPSG:4326")
 
-        _LGA_GDF = gdf
+        # Prepare in place (shapely 2): vectorised contains() then uses the
+        # prepared-geometry fast path on every lookup.
+        shapely.prepare(gdf.geometry.values)
 
-    return _LGA_GDF
+        _LGA_INDEX = (gdf, STRtree(gdf.geometry.values))
+        return _LGA_INDEX
 
 
-def lga_from_latlon(lat: float, lon: float) -> str | None:
+def _load_lgas() -> gpd.GeoDataFrame:
     """
-    Return the LGA name for a given latitude/longitude.
+    Load AU LGA polygons (simplified artifact) once and keep them in memory.
     """
-    gdf = _load_lgas()
+    return _load_index()[0]
+
+
+def _lga_row_from_latlon(lat: float, lon: float) -> int | None:
+    """Row position in the LGA frame of the polygon containing lat/lon, or None."""
+    gdf, tree = _load_index()
 
     point = Point(lon, lat)  # shapely uses (x, y) == (lon, lat)
-    match = gdf[gdf.contains(point)]
 
-    if match.empty:
+    # Bounding-box candidates from the tree, then an exact test against the
+    # prepared polygons (a tree predicate query would only prepare the point).
+    cand = tree.query(point)
+    if len(cand) == 0:
+        return None
+
+    cand.sort()
+    hits = cand[shapely.contains(gdf.geometry.values[cand], point)]
+
+    if len(hits) == 0:
+        return None
+
+    return int(hits[0])
+
+
+def lga_from_latlon(lat: float, lon: float) -> str | None:
+    """
+    Return the LGA name for a given latitude/longitude.
+    """
+    pos = _lga_row_from_latlon(lat, lon)
+    if pos is None:
         return None
 
-    return str(match.iloc[0][LGA_NAME_COL])
+    return str(_load_lgas().iloc[pos][LGA_NAME_COL])
+
+
+def lga_and_state_from_latlon(lat: float, lon: float) -> tuple[str | None, str | None]:
+    """
+    Return (LGA name, state code) for a given latitude/longitude.
+
+    Used when the caller has coordinates but no geocoder result to take the
+    state from.
+    """
+    pos = _lga_row_from_latlon(lat, lon)
+    if pos is None:
+        return None, None
+
+    row = _load_lgas().iloc[pos]
+    state = row[LGA_STATE_COL] if LGA_STATE_COL in row.index else None
+    return str(row[LGA_NAME_COL]), (str(state) if state else None)
+
+
+def lga_from_latlons(lats: Sequence[float], lons: Sequence[float]) -> list[str | None]:
+    """
+    Batch version of lga_from_latlon: one vectorised GEOS pass for all points.
+
+    Returns one LGA name (or None) per input coordinate, in input order.
+    """
+    if len(lats) != len(lons):
+        raise ValueError("lats and lons must be the same length")
+
+    gdf, tree = _load_index()
+
+    points = shapely.points(lons, lats)
+    point_idx, poly_idx = tree.query(points)
+
+    # Exact test on bbox candidates using the prepared polygons
+    mask = shapely.contains(gdf.geometry.values[poly_idx], points[point_idx])
+    point_idx, poly_idx = point_idx[mask], poly_idx[mask]
+
+    names = gdf[LGA_NAME_COL].to_numpy()
+    out: list[str | None] = [None] * len(points)
+    # Walk matches in descending polygon order so the lowest row wins, as in lga_from_latlon
+    for p, g in sorted(zip(point_idx.tolist(), poly_idx.tolist()), key=lambda t: -t[1]):
+        out[p] = str(names[g])
+
+    return out
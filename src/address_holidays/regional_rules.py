@@ -1,13 +1,37 @@
 from __future__ import annotations
 
+import bisect
 import csv
+import functools
+import heapq
+import itertools
+import operator
+import sys
 import warnings
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, date
 from pathlib import Path
-
-
-@dataclass(frozen=True)
+from typing import Iterable, Sequence
+
+# CSV schema / enum validation for load_regional_rules
+_REQUIRED_COLS = frozenset({
+    "date",
+    "name",
+    "state",
+    "match_type",
+    "match_value",
+    "scope",
+    "applies_to",
+})
+_ALLOWED_MATCH_TYPES = frozenset({"LGA", "POSTCODE", "LOCALITY"})
+_ALLOWED_SCOPES = frozenset({"FULL_DAY", "HALF_DAY_AM", "HALF_DAY_PM"})
+_ALLOWED_APPLIES_TO = frozenset({"ALL", "PUBLIC_SERVICE_ONLY", "BANKING_ONLY"})
+_ALLOWED_STATES = frozenset({"ACT", "NSW", "NT", "QLD", "SA", "TAS", "VIC", "WA"})
+# LOCALITY values containing these look like council names (warn only)
+_LOCALITY_BAD_TOKENS = ("city of", "shire of", "council", "municipality")
+
+
+@dataclass(frozen=True, slots=True)
 class RegionalHolidayRule:
     date: date
     name: str
@@ -18,6 +42,60 @@ class RegionalHolidayRule:
     applies_to: str      # ALL | PUBLIC_SERVICE_ONLY | BANKING_ONLY
     source: str
     notes: str
+    # Normalised match keys, computed once per rule rather than per match
+    state_norm: str = field(init=False, repr=False, compare=False)
+    match_value_norm: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "state_norm", _norm(self.state).upper())
+        object.__setattr__(self, "match_value_norm", _norm(self.match_value))
+
+
+@dataclass(frozen=True, eq=False)
+class RegionalRuleIndex:
+    """
+    Rules keyed by normalised (state, match_type) -> match_value for O(1) matching.
+    Entries keep the rule's position in the loaded list so matches come back
+    in load order (by date, then file order), as a linear scan would return them.
+
+    `unrestricted` holds only applies_to == "ALL" rules (the default query).
+
+    Compared/hashed by identity so it can key caches of derived results.
+    """
+    rules: tuple[RegionalHolidayRule, ...]
+    by_key: dict[tuple[str, str], dict[str, list[tuple[int, RegionalHolidayRule]]]]
+    unrestricted: dict[tuple[str, str], dict[str, list[tuple[int, RegionalHolidayRule]]]]
+
+
+def _parse_date(raw: str) -> date:
+    """
+    Parse YYYY-MM-DD. Canonical strings take an integer-slicing fast path;
+    anything else goes through strptime (same leniency, e.g. '2025-1-5').
+    Raises ValueError on invalid dates.
+    """
+    if (
+        len(raw) == 10
+        and raw[4] == "-"
+        and raw[7] == "-"
+        and raw[:4].isdigit()
+        and raw[5:7].isdigit()
+        and raw[8:].isdigit()
+    ):
+        return date(int(raw[:4]), int(raw[5:7]), int(raw[8:]))
+    return datetime.strptime(raw, "%Y-%m-%d").date()
+
+
+def _cell(row: list[str], idx: int | None) -> str:
+    """Column value by position; "" for absent columns or short rows."""
+    if idx is None or idx >= len(row):
+        return ""
+    return row[idx]
+
+
+def _cell_upper(row: list[str], idx: int | None) -> str:
+    """Stripped, upper-cased enum cell; empty cells skip the upper() copy."""
+    value = _cell(row, idx).strip()
+    return value.upper() if value else value
 
 
 def _data_dir() -> Path:
@@ -39,115 +117,141 @@ def load_regional_rules(year: int) -> list[RegionalHolidayRule]:
     - Invalid rows are skipped with warnings.
     """
     path = _data_dir() / f"regional_holidays_{year}.csv"
-    if not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
 
+    return list(_load_regional_rules_cached(path, mtime_ns))
+
+
+def load_regional_rule_index(year: int) -> RegionalRuleIndex:
+    """
+    Same as load_regional_rules, but returns the pre-built match index
+    (cached alongside the parsed rules).
+    """
+    path = _data_dir() / f"regional_holidays_{year}.csv"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return build_rule_index(())
+
+    return _load_regional_rule_index_cached(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_regional_rule_index_cached(path: Path, mtime_ns: int) -> RegionalRuleIndex:
+    return build_rule_index(_load_regional_rules_cached(path, mtime_ns))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_regional_rules_cached(path: Path, mtime_ns: int) -> tuple[RegionalHolidayRule, ...]:
+    """
+    Parse a regional rules CSV. Cached per (path, mtime) so repeat calls are free
+    while edits to the file are still picked up.
+    """
     rules: list[RegionalHolidayRule] = []
 
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8", buffering=1 << 20) as f:
+        # Plain csv.reader + column positions resolved once from the header
+        # (no per-row dict like DictReader)
+        reader = csv.reader(f)
+        header = next(reader, [])
 
         # --- header validation (warnings only) ---
-        required_cols = {
-            "date",
-            "name",
-            "state",
-            "match_type",
-            "match_value",
-            "scope",
-            "applies_to",
-        }
-
-        fieldnames = set(reader.fieldnames or [])
-        missing = required_cols - fieldnames
+        fieldnames = set(header)
+        missing = _REQUIRED_COLS - fieldnames
         if missing:
             warnings.warn(
                 f"[regional_rules] {path.name}: missing required columns "
                 f"{sorted(missing)}. No regional rules loaded.",
                 RuntimeWarning,
             )
-            return []
-
-        allowed_match_types = {"LGA", "POSTCODE", "LOCALITY"}
-        allowed_scopes = {"FULL_DAY", "HALF_DAY_AM", "HALF_DAY_PM"}
-        allowed_applies_to = {"ALL", "PUBLIC_SERVICE_ONLY", "BANKING_ONLY"}
-        allowed_states = {"ACT", "NSW", "NT", "QLD", "SA", "TAS", "VIC", "WA"}
+            return ()
+
+        # Last occurrence wins for duplicate headers, as with DictReader
+        col = {name: i for i, name in enumerate(header)}
+        i_date = col["date"]
+        i_name = col["name"]
+        i_state = col["state"]
+        i_match_type = col["match_type"]
+        i_match_value = col["match_value"]
+        i_scope = col["scope"]
+        i_applies_to = col["applies_to"]
+        i_source = col.get("source")
+        i_notes = col.get("notes")
+
+        # Row-level issues are collected and reported in one warning per file
+        problems: list[str] = []
 
         for row in reader:
             # Skip completely blank lines
-            if not row or not row.get("date"):
+            if not _cell(row, i_date):
                 continue
 
             row_num = reader.line_num
 
             # Extract & normalize raw values
-            raw_date = (row.get("date") or "").strip()
-            raw_name = (row.get("name") or "").strip()
-            raw_state = (row.get("state") or "").strip().upper()
-            raw_match_type = (row.get("match_type") or "").strip().upper()
-            raw_match_value = (row.get("match_value") or "").strip()
-            raw_scope = (row.get("scope") or "").strip().upper()
-            raw_applies_to = (row.get("applies_to") or "").strip().upper()
+            raw_date = _cell(row, i_date).strip()
+            raw_name = _cell(row, i_name).strip()
+            raw_state = _cell_upper(row, i_state)
+            raw_match_type = _cell_upper(row, i_match_type)
+            raw_match_value = _cell(row, i_match_value).strip()
+            raw_scope = _cell_upper(row, i_scope)
+            raw_applies_to = _cell_upper(row, i_applies_to)
 
             # Required values present?
             if not all([raw_date, raw_name, raw_state, raw_match_type, raw_match_value]):
-                warnings.warn(
-                    f"[regional_rules] {path.name}:{row_num}: missing required values. "
-                    "Row skipped.",
-                    RuntimeWarning,
+                problems.append(
+                    f"{row_num}: missing required values. "
+                    "Row skipped."
                 )
                 continue
 
             # Validate enums
-            if raw_match_type not in allowed_match_types:
-                warnings.warn(
-                    f"[regional_rules] {path.name}:{row_num}: invalid match_type "
-                    f"{raw_match_type!r}. Row skipped.",
-                    RuntimeWarning,
+            if raw_match_type not in _ALLOWED_MATCH_TYPES:
+                problems.append(
+                    f"{row_num}: invalid match_type "
+                    f"{raw_match_type!r}. Row skipped."
                 )
                 continue
 
-            if raw_scope and raw_scope not in allowed_scopes:
-                warnings.warn(
-                    f"[regional_rules] {path.name}:{row_num}: invalid scope "
-                    f"{raw_scope!r}. Row skipped.",
-                    RuntimeWarning,
+            if raw_scope and raw_scope not in _ALLOWED_SCOPES:
+                problems.append(
+                    f"{row_num}: invalid scope "
+                    f"{raw_scope!r}. Row skipped."
                 )
                 continue
 
-            if raw_applies_to and raw_applies_to not in allowed_applies_to:
-                warnings.warn(
-                    f"[regional_rules] {path.name}:{row_num}: invalid applies_to "
-                    f"{raw_applies_to!r}. Row skipped.",
-                    RuntimeWarning,
+            if raw_applies_to and raw_applies_to not in _ALLOWED_APPLIES_TO:
+                problems.append(
+                    f"{row_num}: invalid applies_to "
+                    f"{raw_applies_to!r}. Row skipped."
                 )
                 continue
 
-            if raw_state not in allowed_states:
-                warnings.warn(
-                    f"[regional_rules] {path.name}:{row_num}: suspicious state "
-                    f"{raw_state!r}.",
-                    RuntimeWarning,
+            if raw_state not in _ALLOWED_STATES:
+                problems.append(
+                    f"{row_num}: suspicious state "
+                    f"{raw_state!r}."
                 )
 
             # Locality hygiene warning (warn only)
             if raw_match_type == "LOCALITY":
                 mv_lower = raw_match_value.lower()
-                if any(tok in mv_lower for tok in ("city of", "shire of", "council", "municipality")):
-                    warnings.warn(
-                        f"[regional_rules] {path.name}:{row_num}: suspicious LOCALITY "
-                        f"match_value {raw_match_value!r}.",
-                        RuntimeWarning,
+                if any(tok in mv_lower for tok in _LOCALITY_BAD_TOKENS):
+                    problems.append(
+                        f"{row_num}: suspicious LOCALITY "
+                        f"match_value {raw_match_value!r}."
                     )
 
             # Parse date
             try:
-                parsed_date = datetime.strptime(raw_date, "%Y-%m-%d").date()
+                parsed_date = _parse_date(raw_date)
             except ValueError:
-                warnings.warn(
-                    f"[regional_rules] {path.name}:{row_num}: invalid date "
-                    f"{raw_date!r}. Expected YYYY-MM-DD. Row skipped.",
-                    RuntimeWarning,
+                problems.append(
+                    f"{row_num}: invalid date "
+                    f"{raw_date!r}. Expected YYYY-MM-DD. Row skipped."
                 )
                 continue
 
@@ -155,26 +259,69 @@ def load_regional_rules(year: int) -> list[RegionalHolidayRule]:
                 RegionalHolidayRule(
                     date=parsed_date,
                     name=raw_name,
-                    state=raw_state,
-                    match_type=raw_match_type,
+                    # Enum-like fields interned: equality checks become pointer compares
+                    state=sys.intern(raw_state),
+                    match_type=sys.intern(raw_match_type),
                     match_value=raw_match_value,
-                    scope=raw_scope or "FULL_DAY",
-                    applies_to=raw_applies_to or "ALL",
-                    source=(row.get("source") or "").strip(),
-                    notes=(row.get("notes") or "").strip(),
+                    scope=sys.intern(raw_scope or "FULL_DAY"),
+                    applies_to=sys.intern(raw_applies_to or "ALL"),
+                    source=_cell(row, i_source).strip(),
+                    notes=_cell(row, i_notes).strip(),
                 )
             )
 
-    return rules
+    if problems:
+        warnings.warn(
+            f"[regional_rules] {path.name}: {len(problems)} row issue(s):\n"
+            + "\n".join(f"  line {p}" for p in problems),
+            RuntimeWarning,
+        )
+
+    # Date order (stable, so file order breaks ties) enables rules_in_range()
+    rules.sort(key=_rule_date)
+    return tuple(rules)
+
 
 
 
+def _rule_date(r: RegionalHolidayRule) -> date:
+    return r.date
 
+
+def rules_in_range(
+    rules: Sequence[RegionalHolidayRule],
+    start: date,
+    end: date,
+) -> Sequence[RegionalHolidayRule]:
+    """
+    Rules dated within [start, end] inclusive, by binary search.
+    `rules` must be date-sorted, as returned by load_regional_rules.
+    """
+    lo = bisect.bisect_left(rules, start, key=_rule_date)
+    hi = bisect.bisect_right(rules, end, key=_rule_date)
+    return rules[lo:hi]
+
+
+@functools.lru_cache(maxsize=8192)
 def _norm(s: str | None) -> str:
     return " ".join((s or "").strip().lower().split())
 
+
+def build_rule_index(rules: Iterable[RegionalHolidayRule]) -> RegionalRuleIndex:
+    rules = tuple(rules)
+    by_key: dict[tuple[str, str], dict[str, list[tuple[int, RegionalHolidayRule]]]] = {}
+    unrestricted: dict[tuple[str, str], dict[str, list[tuple[int, RegionalHolidayRule]]]] = {}
+    for pos, r in enumerate(rules):
+        # match_type is already upper-cased by load_regional_rules
+        key = (r.state_norm, r.match_type)
+        by_key.setdefault(key, {}).setdefault(r.match_value_norm, []).append((pos, r))
+        if r.applies_to == "ALL":
+            unrestricted.setdefault(key, {}).setdefault(r.match_value_norm, []).append((pos, r))
+    return RegionalRuleIndex(rules=rules, by_key=by_key, unrestricted=unrestricted)
+
+
 def match_regional_rules(
-    rules: list[RegionalHolidayRule],
+    rules: RegionalRuleIndex | Iterable[RegionalHolidayRule],
     *,
     state: str,
     lga: str | None,
@@ -187,25 +334,35 @@ def match_regional_rules(
     postcode_n = _norm(postcode)
     locality_n = _norm(locality)
 
-    matched: list[RegionalHolidayRule] = []
-    for r in rules:
-        if _norm(r.state).upper() != state_n:
-            continue
+    # Callers that match repeatedly should pass the cached load_regional_rule_index()
+    index = rules if isinstance(rules, RegionalRuleIndex) else build_rule_index(rules)
 
-        if (not include_restricted) and (r.applies_to != "ALL"):
-            continue
+    by_key = index.by_key if include_restricted else index.unrestricted
 
-        mt = r.match_type.upper()
-        mv = _norm(r.match_value)
+    hits: list[tuple[int, RegionalHolidayRule]] = []
+    for match_type, value in (("LGA", lga_n), ("POSTCODE", postcode_n), ("LOCALITY", locality_n)):
+        hits.extend(by_key.get((state_n, match_type), {}).get(value, ()))
 
-        if mt == "LGA" and mv == lga_n:
-            matched.append(r)
-        elif mt == "POSTCODE" and mv == postcode_n:
-            matched.append(r)
-        elif mt == "LOCALITY" and mv == locality_n:
-            matched.append(r)
+    # A rule can only sit under one key, so no de-dupe needed; restore file order
+    hits.sort(key=lambda t: t[0])
 
-    return matched
+    return [r for _, r in hits]
+
+
+def has_address_keyed_rules(index: RegionalRuleIndex, state: str | None) -> bool:
+    """
+    True if `state` has (unrestricted) POSTCODE or LOCALITY rules, i.e. rules
+    that can only match when the location's postcode/locality is known.
+    """
+    state_n = _norm(state).upper()
+    return any(
+        index.unrestricted.get((state_n, match_type))
+        for match_type in ("POSTCODE", "LOCALITY")
+    )
+
+
+def _holiday_sort_key(h: dict) -> tuple:
+    return (h.get("date", ""), h.get("name", ""))
 
 
 def merge_holidays(
@@ -222,17 +379,18 @@ def merge_holidays(
       - source (optional)
       - is_regional (bool)
     """
-    # de-dupe by (date, name)
-    seen = {(h.get("date"), h.get("name")) for h in base_holidays}
+    # de-dupe by (date, name); dict keeps first-seen order
+    seen: dict[tuple, None] = dict.fromkeys((h.get("date"), h.get("name")) for h in base_holidays)
 
-    out = list(base_holidays)
+    additions: list[dict] = []
     for r in regional_rules:
-        key = (r.date.isoformat(), r.name)
+        iso = r.date.isoformat()
+        key = (iso, r.name)
         if key in seen:
             continue
-        out.append(
+        additions.append(
             {
-                "date": r.date.isoformat(),
+                "date": iso,
                 "name": r.name,
                 "scope": r.scope,
                 "source": r.source,
@@ -241,11 +399,18 @@ def merge_holidays(
                 "notes": r.notes,
             }
         )
-        seen.add(key)
+        seen[key] = None
 
     # optional: sort by date then name
-    out.sort(key=lambda x: (x.get("date", ""), x.get("name", "")))
-    return out
+    # additions always carry both keys, so the C-level itemgetter is safe here
+    additions.sort(key=operator.itemgetter("date", "name"))
+
+    base_keys = [_holiday_sort_key(h) for h in base_holidays]
+    if all(a <= b for a, b in zip(base_keys, base_keys[1:])):
+        # Base list is usually already ordered: merge instead of re-sorting everything
+        return list(heapq.merge(base_holidays, additions, key=_holiday_sort_key))
+
+    return sorted(itertools.chain(base_holidays, additions), key=_holiday_sort_key)
 
 
 
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import re
+import threading
 from pathlib import Path
 from typing import Tuple
 
-import markdown  # ensure 'markdown' is in requirements.txt
-
 
 BASE_CSS = """
 body {
@@ -90,26 +90,25 @@ hr {
 """
 
 
-def build_html_and_pdf(
-    md_path: Path,
-    out_dir: Path,
-    title: str = "Compliance Report",
-) -> Tuple[Path, Path | None]:
-    """
-    Convert a Markdown report to styled HTML, and best-effort PDF using WeasyPrint.
+def _minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace (simple CSS only; no strings with braces)."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
 
-    Returns (html_path, pdf_path_or_None).
-    """
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    md_text = md_path.read_text(encoding="utf-8")
-    body_html = markdown.markdown(md_text, extensions=["tables", "fenced_code"])
+# Minified once at import; inlined into every HTML/PDF report
+BASE_CSS = _minify_css(BASE_CSS)
+
 
-    html_doc = f"""<!DOCTYPE html>
+# Static parts of the HTML document (CSS baked in), written around title/body
+_HTML_HEAD_OPEN = """<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
-  <title>{title}</title>
+  <title>"""
+_HTML_HEAD_CLOSE = f"""</title>
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <style>
   {BASE_CSS}
@@ -117,22 +116,77 @@ def build_html_and_pdf(
 </head>
 <body>
   <div class="report-container">
-    {body_html}
+    """
+# PDF variant: no inline <style>; WeasyPrint gets the pre-parsed stylesheet instead
+_PDF_HEAD_CLOSE = """</title>
+</head>
+<body>
+  <div class="report-container">
+    """
+_HTML_TAIL = """
   </div>
 </body>
 </html>
 """
 
+# weasyprint.CSS parsed from BASE_CSS on first PDF build, then reused
+_WEASY_CSS = None
+
+# One Markdown converter (extensions registered once), reset between documents.
+# Created lazily so importing this module doesn't pay for `markdown`.
+# Markdown instances are not thread-safe, so conversions are serialised.
+_MD = None
+_MD_LOCK = threading.Lock()
+
+
+def _markdown_to_html(md_text: str) -> str:
+    global _MD
+
+    with _MD_LOCK:
+        if _MD is None:
+            import markdown  # ensure 'markdown' is in requirements.txt
+
+            _MD = markdown.Markdown(extensions=["tables", "fenced_code"])
+        return _MD.reset().convert(md_text)
+
+
+def build_html_and_pdf(
+    md_path: Path,
+    out_dir: Path,
+    title: str = "Compliance Report",
+) -> Tuple[Path, Path | None]:
+    """
+    Convert a Markdown report to styled HTML, and best-effort PDF using WeasyPrint.
+
+    Returns (html_path, pdf_path_or_None).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    md_text = md_path.read_text(encoding="utf-8")
+    body_html = _markdown_to_html(md_text)
+
     html_path = out_dir / "report.html"
-    html_path.write_text(html_doc, encoding="utf-8")
+    with html_path.open("w", encoding="utf-8") as f:
+        f.write(_HTML_HEAD_OPEN)
+        f.write(title)
+        f.write(_HTML_HEAD_CLOSE)
+        f.write(body_html)
+        f.write(_HTML_TAIL)
 
     # Best-effort PDF via WeasyPrint
     pdf_path: Path | None = None
     try:
-        from weasyprint import HTML  # type: ignore
+        from weasyprint import CSS, HTML  # type: ignore
+
+        global _WEASY_CSS
+        if _WEASY_CSS is None:
+            _WEASY_CSS = CSS(string=BASE_CSS)
 
         pdf_path = out_dir / "report.pdf"
-        HTML(string=html_doc, base_url=str(out_dir)).write_pdf(str(pdf_path))
+        pdf_doc = _HTML_HEAD_OPEN + title + _PDF_HEAD_CLOSE + body_html + _HTML_TAIL
+        HTML(string=pdf_doc, base_url=str(out_dir)).write_pdf(
+            str(pdf_path), stylesheets=[_WEASY_CSS]
+        )
     except Exception:
         # PDF generation is optional; swallow any errors.
         pdf_path = None
@@ -1,21 +1,53 @@
 from __future__ import annotations
 
+import codecs
 import csv
-from dataclasses import dataclass
+import functools
+import heapq
+import io
+import operator
+import re
+import sys
+from collections import Counter
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from datetime import datetime
 
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _iso_to_long_fast(s: str) -> str | None:
+    """
+    'YYYY-MM-DD' -> 'DD Mon YYYY' by slicing, without strftime.
+    Returns None for anything else so callers fall back to the full parser.
+    """
+    if len(s) != 10 or s[4] != "-" or s[7] != "-" or not s.isascii():
+        return None
+    y, m, d = s[0:4], s[5:7], s[8:10]
+    if not (y + m + d).isdigit() or y < "1000":
+        return None
+    try:
+        date(int(y), int(m), int(d))  # reject impossible dates like fromisoformat does
+    except ValueError:
+        return None
+    return f"{d} {_MONTHS[int(m) - 1]} {y}"
+
+
 def fmt_date(d: date) -> str:
-    return d.strftime("%d %b %Y")
+    # Same output as d.strftime("%d %b %Y"), without strftime's format parsing
+    return f"{d.day:02d} {_MONTHS[d.month - 1]} {d.year}"
 
+# ISO formatters are memoised: the same few period/holiday dates repeat across rows.
+
+@functools.lru_cache(maxsize=4096)
 def fmt_iso_date(s: str | None) -> str:
     if not s or not str(s).strip():
         return "—"
     # handle YYYY-MM-DD strings safely
-    return date.fromisoformat(str(s)).strftime("%d %b %Y")
+    s = str(s)
+    return _iso_to_long_fast(s) or date.fromisoformat(s).strftime("%d %b %Y")
 
 
 
@@ -37,6 +69,12 @@ STATUS_ORDER = [
     "OK",
     "INFO",
 ]
+_STATUS_ORDER_IDX = {s: i for i, s in enumerate(STATUS_ORDER)}
+
+SEVERITY_ORDER = {"HIGH": 0, "MED": 1, "LOW": 2, "INFO": 3}
+
+# Statuses where the applicable holiday calendar could not be determined at all
+_UNRESOLVED_STATUSES = frozenset({"NOT_FOUND", "AMBIGUOUS_LGA"})
 
 SEVERITY_EXPLANATION = """
     ### Severity classification (how to read this report)
@@ -59,15 +97,75 @@ SEVERITY_EXPLANATION = """
     public holiday entitlements.
 """
 
+# Per-finding (msg, why, next_action) wording, keyed on (status, manual_review).
+# Deterministic: missing address first, then status, then the manual-review default.
+_MISSING_ADDRESS_MESSAGES: Tuple[str, str, str] = (
+    "No work location is recorded for this employee; public holiday applicability cannot be determined.",
+    "Without any work address or location, the applicable public holiday calendar cannot be identified, so entitlements depending on public holidays cannot be confirmed.",
+    "Record the employee’s primary work location (e.g. usual worksite or region) and rerun the public holiday check.",
+)
+
+_NOT_FOUND_MESSAGES: Tuple[str, str, str] = (
+    "Work location could not be resolved; public holiday applicability cannot be determined.",
+    "Without a resolvable work location, public holiday calendars cannot be applied reliably.",
+    "Correct the address input (include suburb + state/postcode), rerun, and validate the result.",
+)
+
+_FINDING_MESSAGES: Dict[Tuple[str, bool], Tuple[str, str, str]] = {
+    ("NOT_FOUND", True): _NOT_FOUND_MESSAGES,
+    ("NOT_FOUND", False): _NOT_FOUND_MESSAGES,
+    ("LOW_CONFIDENCE", True): (
+        "Public holiday applicability was derived, but entitlement outcome cannot be confirmed until location is validated.",
+        "Low certainty in the resolved location may change which public holiday calendar applies, potentially affecting payment, penalty rates, or substitute day entitlements.",
+        "Validate the employee’s work location against internal records, then rerun if corrections are required.",
+    ),
+    ("LOW_CONFIDENCE", False): (
+        "Public holiday applicability was derived for the pay period based on recorded work location.",
+        "Public holiday entitlements are location-dependent; holidays in-period drive correct treatment.",
+        "Confirm payroll configuration/pay events align with the applicable holiday calendar for this location.",
+    ),
+}
+
+_DEFAULT_FINDING_MESSAGES: Dict[bool, Tuple[str, str, str]] = {
+    True: (
+        "Entitlement outcome cannot be confirmed without further validation due to uncertainty in applicable location.",
+        "Ambiguity in LGA/locality mapping can change applicable regional holidays.",
+        "Validate the employee’s applicable work location and confirm public holiday treatment.",
+    ),
+    False: (
+        "Public holiday applicability was derived for the pay period.",
+        "This identifies holidays in-period that may affect pay treatment.",
+        "Cross-check payroll pay events for the listed holiday dates.",
+    ),
+}
+
+
+# Non-empty, whitespace-trimmed items of a ";"-separated list, e.g. holiday_dates_in_period.
+# Same result as [x.strip() for x in s.split(";") if x.strip()] without the temporaries.
+_split_semicolon_list = re.compile(r"[^;\s](?:[^;]*[^;\s])?").findall
+
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "y", "t"})
+
 
 def _as_bool(value: Any) -> bool:
     if value is None:
         return False
-    s = str(value).strip().lower()
-    return s in {"true", "1", "yes", "y", "t"}
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return str(value).strip().lower() in _TRUE_STRINGS
 
 
 def _as_float(value: Any, default: float = 0.0) -> float:
+    if type(value) is float:
+        return value
+    if isinstance(value, str):
+        s = value.strip()
+        if not s:
+            return default
+        try:
+            return float(s)
+        except ValueError:
+            return default
     try:
         if value is None or str(value).strip() == "":
             return default
@@ -79,10 +177,26 @@ def _as_float(value: Any, default: float = 0.0) -> float:
 def _clean(value: Any) -> str:
     if value is None:
         return ""
+    if isinstance(value, str):
+        return value.strip()
     return str(value).strip()
 
 
 def _safe_int(value: Any, default: int = 0) -> int:
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        s = value.strip()
+        if not s:
+            return default
+        try:
+            return int(s)
+        except ValueError:
+            pass
+        try:
+            return int(float(s))
+        except (ValueError, OverflowError):
+            return default
     try:
         if value is None or str(value).strip() == "":
             return default
@@ -93,9 +207,7 @@ def _safe_int(value: Any, default: int = 0) -> int:
 
 def _status_sort_key(status: str) -> Tuple[int, str]:
     s = (status or "").strip()
-    if s in STATUS_ORDER:
-        return (STATUS_ORDER.index(s), s)
-    return (999, s)
+    return (_STATUS_ORDER_IDX.get(s, 999), s)
 
 
 def _status_to_severity(status: str | None, manual_review: bool, holiday_count_in_period: int) -> str:
@@ -110,7 +222,7 @@ def _status_to_severity(status: str | None, manual_review: bool, holiday_count_i
     hc = int(holiday_count_in_period or 0)
 
     # Highest risk: cannot determine applicable holiday calendar at all
-    if s in {"NOT_FOUND", "AMBIGUOUS_LGA"}:
+    if s in _UNRESOLVED_STATUSES:
         return "HIGH"
 
     # Location resolved but uncertain: severity depends on whether holidays actually apply
@@ -148,7 +260,7 @@ def _row_to_severity(row: Dict[str, Any]) -> str:
         return "HIGH"
 
     # 2. Engine says we could not reliably determine the calendar
-    if status in {"NOT_FOUND", "AMBIGUOUS_LGA"}:
+    if status in _UNRESOLVED_STATUSES:
         return "HIGH"
 
     # 3. LOW_CONFIDENCE handling (most of the real-world fuzziness)
@@ -178,6 +290,8 @@ def _row_to_severity(row: Dict[str, Any]) -> str:
     return "INFO"
 
 def _as_int(value: object, default: int = 0) -> int:
+    if type(value) is int or isinstance(value, str):
+        return _safe_int(value, default)
     try:
         if value is None:
             return default
@@ -188,6 +302,7 @@ def _as_int(value: object, default: int = 0) -> int:
     except Exception:
         return default
 
+@functools.lru_cache(maxsize=4096)
 def _fmt_iso_to_long(value: str | None) -> str:
     """
     Convert ISO date strings (YYYY-MM-DD) to 'DD Mon YYYY'.
@@ -195,14 +310,87 @@ def _fmt_iso_to_long(value: str | None) -> str:
     """
     if not value:
         return ""
+    fast = _iso_to_long_fast(str(value))
+    if fast:
+        return fast
     try:
         return datetime.fromisoformat(str(value)).date().strftime("%d %b %Y")
     except Exception:
         return str(value)
 
 
-@dataclass(frozen=True)
-class ReportContext:
+@functools.lru_cache(maxsize=4096)
+def _holiday_date_label(d: str) -> str:
+    """Display label for a holiday date: 'DD Mon YYYY' for YYYY-MM-DD shaped values, else as-is."""
+    return _fmt_iso_to_long(d) if len(d) == 10 and d[4] == "-" else d
+
+
+def _annotate_finding(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach derived per-row fields (severity, sort keys, split holiday lists), computed once per row."""
+    sev = _row_to_severity(r)
+    r["_sev"] = sev
+    r["_sev_order"] = SEVERITY_ORDER.get(sev, 9)
+    r["_status_order"] = _status_sort_key(_clean(r.get("status")))[0]
+    r["_emp_clean"] = _clean(r.get("employee_id"))
+    # Holiday date/name lists, split once and shared by summarise() and rendering
+    r["_holiday_dates"] = _split_semicolon_list(r.get("holiday_dates_in_period") or "")
+    r["_holiday_names"] = _split_semicolon_list(r.get("holiday_names_in_period") or "")
+    r["_holiday_date_labels"] = [_holiday_date_label(d) for d in r["_holiday_dates"]]
+    return r
+
+
+def _prepare_finding(r: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    For rows not produced by load_findings(): an annotated shallow copy with
+    absent columns filled with None. The caller's dict is left untouched.
+    """
+    prepared = dict.fromkeys(FINDING_FIELDS)
+    prepared.update(r)
+    return _annotate_finding(prepared)
+
+
+_FINDING_SORT_KEY = operator.itemgetter("_sev_order", "_status_order", "_emp_clean")
+
+# Columns summarise() reads, in unpack order
+_SUMMARY_FIELDS = operator.itemgetter(
+    "pay_period_start",
+    "pay_period_end",
+    "manual_review",
+    "status",
+    "input_address",
+    "_sev",
+    "holiday_count_in_period",
+    "_holiday_dates",
+    "_holiday_names",
+)
+
+# Every column a detailed-finding block reads, fetched in one C call per row.
+# load_findings() guarantees all FINDING_FIELDS keys exist (None when the column is absent).
+_RENDER_FIELDS = operator.itemgetter(
+    "status",
+    "manual_review",
+    "work_mode",
+    "input_address",
+    "formatted_address",
+    "state",
+    "postcode",
+    "locality",
+    "lga",
+    "pay_period_start",
+    "pay_period_end",
+    "holiday_count_in_period",
+    "holiday_dates_in_period",
+    "_holiday_date_labels",
+    "_holiday_names",
+    "confidence",
+    "geocode_quality",
+    "lga_resolution_method",
+    "rules_applied",
+    "replacement_applied",
+)
+
+
+class ReportContext(NamedTuple):
     prepared_as_at: date
     findings_csv: Path
     output_dir: Path
@@ -211,100 +399,168 @@ class ReportContext:
     period_end: Optional[date]
 
 
+# Findings CSV columns read by the report; anything else in the file is ignored.
+FINDING_FIELDS: Tuple[str, ...] = (
+    "employee_id",
+    "work_mode",
+    "input_address",
+    "formatted_address",
+    "state",
+    "postcode",
+    "locality",
+    "lga",
+    "pay_period_start",
+    "pay_period_end",
+    "holiday_count_in_period",
+    "holiday_dates_in_period",
+    "holiday_names_in_period",
+    "status",
+    "manual_review",
+    "confidence",
+    "audit_message",
+    "geocode_quality",
+    "lga_resolution_method",
+    "rules_applied",
+    "replacement_applied",
+)
+
+# Low-cardinality columns: stored stripped and interned so repeats share one string
+_INTERNED_FIELDS: Tuple[str, ...] = (
+    "status",
+    "work_mode",
+    "state",
+    "geocode_quality",
+    "lga_resolution_method",
+)
+
+
 def load_findings(findings_csv: Path) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
-    with findings_csv.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            # Normalise a few fields we use a lot
-            r["manual_review"] = _as_bool(r.get("manual_review"))
-            r["confidence"] = _as_float(r.get("confidence"), default=0.0)
-            r["holiday_count_in_period"] = _safe_int(r.get("holiday_count_in_period"), default=0)
-            rows.append(r)
-    return rows
-
+    raw = findings_csv.open("rb", buffering=1 << 20)
+    # Skip a UTF-8 BOM once up front, then decode as plain utf-8 (not utf-8-sig)
+    if raw.peek(3)[:3] == codecs.BOM_UTF8:
+        raw.read(3)
+    with io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        headers = next(reader, None)
+        if not headers:
+            return rows
+
+        # Resolve column positions once (last duplicate header wins, as with DictReader)
+        idx = {name: i for i, name in enumerate(headers)}
+        # Absent columns read index -1: the None appended to every row below
+        cols = [(name, idx.get(name, -1)) for name in FINDING_FIELDS]
+        interned = [name for name in _INTERNED_FIELDS if name in idx]
+        width = len(headers)
+
+        as_bool, as_float, safe_int = _as_bool, _as_float, _safe_int
+        annotate = _annotate_finding
+        intern = sys.intern
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += [None] * (width - len(row))
+            row.append(None)
 
-def summarise(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
-    # ----- 1. Try to derive period from explicit pay-period fields -----
-    starts = sorted(
-        {_clean(r.get("pay_period_start")) for r in findings if _clean(r.get("pay_period_start"))}
-    )
-    ends = sorted(
-        {_clean(r.get("pay_period_end")) for r in findings if _clean(r.get("pay_period_end"))}
-    )
+            r = {name: row[i] for name, i in cols}
+            for name in interned:
+                v = r[name]
+                if v:
+                    r[name] = intern(v.strip())
 
-    period_start = starts[0] if starts else ""
-    period_end = ends[-1] if ends else ""
+            # Normalise a few fields we use a lot
+            r["manual_review"] = as_bool(r.get("manual_review"))
+            r["confidence"] = as_float(r.get("confidence"), default=0.0)
+            r["holiday_count_in_period"] = safe_int(r.get("holiday_count_in_period"), default=0)
+            rows.append(annotate(r))
+    return rows
 
-    # ----- 2. Fallback: infer from holiday_dates_in_period (earliest → latest) -----
-    if not period_start or not period_end:
-        all_dates: List[date] = []
-        for r in findings:
-            dates_str = _clean(r.get("holiday_dates_in_period"))
-            if not dates_str:
-                continue
 
-            # holiday_dates_in_period is ;-separated ISO date strings
-            for part in dates_str.split(";"):
-                d = part.strip()
-                if not d:
-                    continue
-                try:
-                    all_dates.append(date.fromisoformat(d))
-                except ValueError:
-                    # ignore anything that isn't an ISO date
-                    continue
+def _order_status_counts(by_status: Counter[str]) -> Dict[str, int]:
+    """Known statuses in STATUS_ORDER order, then any others alphabetically (zero counts omitted)."""
+    ordered = {s: by_status[s] for s in STATUS_ORDER if s in by_status}
+    if len(ordered) < len(by_status):
+        for s in sorted(k for k in by_status if k not in _STATUS_ORDER_IDX):
+            ordered[s] = by_status[s]
+    return ordered
 
-        if all_dates:
-            all_dates.sort()
-            period_start = all_dates[0].isoformat()
-            period_end = all_dates[-1].isoformat()
 
-    total = len(findings)
-    manual_review_count = sum(1 for r in findings if r.get("manual_review") is True)
+def summarise(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Single pass over findings: period bounds, status/severity counts, holiday
+    # count buckets and holiday date frequency (used by the overview section).
+    period_start = ""
+    period_end = ""
+    manual_review_count = 0
 
-    # Counts by status and severity
-    by_status: Dict[str, int] = {}
+    by_status: Counter[str] = Counter()
     by_sev: Dict[str, int] = {"HIGH": 0, "MED": 0, "LOW": 0, "INFO": 0}
+    holiday_counts: Counter[int] = Counter()
 
-    not_found = 0
-    low_conf = 0
+    # Top holiday dates (frequency), optionally including names
+    # key = (date_str, name_str)
+    freq: Counter[Tuple[str, str]] = Counter()
 
     for r in findings:
-        raw_status = _clean(r.get("status"))
-        input_addr = _clean(r.get("input_address"))
-        if not raw_status and not input_addr:
+        if "_sev" not in r:
+            r = _prepare_finding(r)
+        (
+            pstart, pend, manual_review, raw_status, input_addr, sev,
+            hcount, date_parts, name_parts,
+        ) = _SUMMARY_FIELDS(r)
+
+        # ISO dates compare lexicographically, so min/max strings == earliest/latest
+        pstart = _clean(pstart)
+        if pstart and (not period_start or pstart < period_start):
+            period_start = pstart
+        pend = _clean(pend)
+        if pend and pend > period_end:
+            period_end = pend
+
+        if manual_review is True:
+            manual_review_count += 1
+
+        raw_status = _clean(raw_status)
+        if not raw_status and not _clean(input_addr):
             status = "MISSING_ADDRESS"
         else:
             status = raw_status or "UNKNOWN"
+        by_status[status] += 1
 
-        by_status[status] = by_status.get(status, 0) + 1
-
-        sev = _row_to_severity(r)
         by_sev[sev] = by_sev.get(sev, 0) + 1
 
-        if status.upper() == "NOT_FOUND":
-            not_found += 1
-        if status.upper() == "LOW_CONFIDENCE":
-            low_conf += 1
+        holiday_counts[_as_int(hcount, 0)] += 1
 
-    # Holiday distribution within pay period
-    zero_holidays = 0
-    one_holiday = 0
-    two_plus_holidays = 0
+        if date_parts:
+            # Dates without a matching name count under ""
+            if len(name_parts) < len(date_parts):
+                name_parts = name_parts + [""] * (len(date_parts) - len(name_parts))
+            freq.update(zip(date_parts, name_parts))
 
-    for r in findings:
-        try:
-            count = int(r.get("holiday_count_in_period") or 0)
-        except Exception:
-            count = 0
-
-        if count == 0:
-            zero_holidays += 1
-        elif count == 1:
-            one_holiday += 1
-        else:
-            two_plus_holidays += 1
+    # Fallback: infer period from holiday_dates_in_period (earliest → latest)
+    if not period_start or not period_end:
+        all_dates: List[date] = []
+        for dt in {d for d, _ in freq}:
+            try:
+                all_dates.append(date.fromisoformat(dt))
+            except ValueError:
+                # ignore anything that isn't an ISO date
+                continue
+
+        if all_dates:
+            period_start = min(all_dates).isoformat()
+            period_end = max(all_dates).isoformat()
+
+    total = len(findings)
+
+    not_found = sum(n for s, n in by_status.items() if s.upper() == "NOT_FOUND")
+    low_conf = sum(n for s, n in by_status.items() if s.upper() == "LOW_CONFIDENCE")
+
+    # Holiday distribution within pay period
+    zero_holidays = holiday_counts[0]
+    one_holiday = holiday_counts[1]
+    two_plus_holidays = total - zero_holidays - one_holiday
 
     # A simple, deterministic "key messages" list
     key_messages: List[str] = []
@@ -354,187 +610,47 @@ def summarise(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
         "period_end": period_end,
         "total": total,
         "manual_review_count": manual_review_count,
-        "by_status": dict(sorted(by_status.items(), key=lambda kv: _status_sort_key(kv[0]))),
+        "by_status": _order_status_counts(by_status),
         "by_severity": by_sev,
         "key_messages": key_messages,
+        "holiday_counts": holiday_counts,
+        "holiday_date_freq": freq,
     }
 
 
 
-def _md_table(headers: List[str], rows: List[List[str]]) -> str:
+def _md_table_lines(headers: List[str], rows: List[List[str]]) -> List[str]:
     # Simple markdown table helper
     out = []
     out.append("| " + " | ".join(headers) + " |")
     out.append("| " + " | ".join(["---"] * len(headers)) + " |")
     for r in rows:
         out.append("| " + " | ".join(r) + " |")
-    return "\n".join(out)
+    return out
 
 
-def render_markdown(ctx: ReportContext, findings: List[Dict[str, Any]], summary: Dict[str, Any]) -> str:
-    prepared = ctx.prepared_as_at.isoformat()
-    period_start = (
-        fmt_date(ctx.period_start)
-        if ctx.period_start
-        else fmt_iso_date(summary.get("period_start"))
-    )
-    period_end = (
-        fmt_date(ctx.period_end)
-        if ctx.period_end
-        else fmt_iso_date(summary.get("period_end"))
-    )
+def _md_table(headers: List[str], rows: List[List[str]]) -> str:
+    return "\n".join(_md_table_lines(headers, rows))
+
+
+def iter_markdown_lines(
+    ctx: ReportContext, findings: List[Dict[str, Any]], summary: Dict[str, Any]
+) -> Iterator[str]:
+    """Yield the report one line at a time (without trailing newlines), in document order."""
+    prepared = fmt_date(ctx.prepared_as_at)
+    period_start = fmt_iso_date(summary.get("period_start"))
+    period_end = fmt_iso_date(summary.get("period_end"))
 
     # Executive summary bullets
-    exec_bullets = "\n".join([f"- {m}" for m in summary.get("key_messages", [])]) or "- No records were provided."
+    exec_bullets = [f"- {m}" for m in summary.get("key_messages", [])] or ["- No records were provided."]
 
     # Summary tables
     sev_rows = [[k, str(v)] for k, v in summary.get("by_severity", {}).items()]
     status_rows = [[k, str(v)] for k, v in summary.get("by_status", {}).items()]
 
-    # Detailed findings: group by severity then status
-    def find_key(r: Dict[str, Any]) -> Tuple[int, int, str]:
-        status = _clean(r.get("status"))
-        sev = _row_to_severity(r)
-        sev_order = {"HIGH": 0, "MED": 1, "LOW": 2, "INFO": 3}.get(sev, 9)
-        status_order = _status_sort_key(status)[0]
-        emp = _clean(r.get("employee_id"))
-        return (sev_order, status_order, emp)
-
-    findings_sorted = sorted(findings, key=find_key)
+    inputs_list = [f"- `{name}`" for name in (ctx.input_files or [])] or ["- (Not provided)"]
 
-    blocks: List[str] = []
-    for r in findings_sorted:
-        # keep a raw status for display (heading)
-        status_raw = _clean(r.get("status")) or "UNKNOWN"
-        manual = bool(r.get("manual_review"))
-        sev = _row_to_severity(r)
-        emp = _clean(r.get("employee_id"))
-        work_mode = _clean(r.get("work_mode"))
-        addr_in = _clean(r.get("input_address"))
-        addr_fmt = _clean(r.get("formatted_address"))
-        state = _clean(r.get("state"))
-        postcode = _clean(r.get("postcode"))
-        locality = _clean(r.get("locality"))
-        lga = _clean(r.get("lga"))
-        pstart = _clean(r.get("pay_period_start"))
-        pend = _clean(r.get("pay_period_end"))
-        hcount = _safe_int(r.get("holiday_count_in_period"), 0)
-        hdates = _clean(r.get("holiday_dates_in_period"))
-        confidence = _as_float(r.get("confidence"), 0.0)
-        msg = _clean(r.get("audit_message")) or "(No audit message provided.)"
-        geocode_quality = _clean(r.get("geocode_quality"))
-        lga_method = _clean(r.get("lga_resolution_method"))
-        rules_applied = _clean(r.get("rules_applied"))
-        replacement = _clean(r.get("replacement_applied"))
-
-        # “Why it matters” and “Next action” – deterministic, status-driven
-                # “Why it matters” and “Next action” – deterministic, but now also address-aware
-        manual_review = bool(r.get("manual_review") is True)
-        status = status_raw.upper()
-        missing_address = not addr_in  # addr_in already computed above
-
-        if missing_address:
-            msg = "No work location is recorded for this employee; public holiday applicability cannot be determined."
-            why = "Without any work address or location, the applicable public holiday calendar cannot be identified, so entitlements depending on public holidays cannot be confirmed."
-            next_action = "Record the employee’s primary work location (e.g. usual worksite or region) and rerun the public holiday check."
-        elif status == "NOT_FOUND":
-            msg = "Work location could not be resolved; public holiday applicability cannot be determined."
-            why = "Without a resolvable work location, public holiday calendars cannot be applied reliably."
-            next_action = "Correct the address input (include suburb + state/postcode), rerun, and validate the result."
-        elif status == "LOW_CONFIDENCE":
-            if manual_review:
-                msg = "Public holiday applicability was derived, but entitlement outcome cannot be confirmed until location is validated."
-                why = "Low certainty in the resolved location may change which public holiday calendar applies, potentially affecting payment, penalty rates, or substitute day entitlements."
-                next_action = "Validate the employee’s work location against internal records, then rerun if corrections are required."
-            else:
-                msg = "Public holiday applicability was derived for the pay period based on recorded work location."
-                why = "Public holiday entitlements are location-dependent; holidays in-period drive correct treatment."
-                next_action = "Confirm payroll configuration/pay events align with the applicable holiday calendar for this location."
-        else:
-            if manual_review:
-                msg = "Entitlement outcome cannot be confirmed without further validation due to uncertainty in applicable location."
-                why = "Ambiguity in LGA/locality mapping can change applicable regional holidays."
-                next_action = "Validate the employee’s applicable work location and confirm public holiday treatment."
-            else:
-                msg = "Public holiday applicability was derived for the pay period."
-                why = "This identifies holidays in-period that may affect pay treatment."
-                next_action = "Cross-check payroll pay events for the listed holiday dates."
-
-
-        # Build labelled holiday list for evidence (Name + Date)
-        holiday_dates_raw = (r.get("holiday_dates_in_period") or "").strip()
-        holiday_names_raw = (r.get("holiday_names_in_period") or "").strip()
-
-        labelled_holidays = "-"
-        if holiday_dates_raw:
-            dates = [d.strip() for d in holiday_dates_raw.split(";") if d.strip()]
-            names = [n.strip() for n in holiday_names_raw.split(";") if n.strip()] if holiday_names_raw else []
-
-            items = []
-            for i, d in enumerate(dates):
-                date_label = _fmt_iso_to_long(d) if len(d) == 10 and d[4] == "-" else d
-                if i < len(names) and names[i]:
-                    items.append(f"{names[i]} ({date_label})")
-                else:
-                    items.append(date_label)
-
-            labelled_holidays = "; ".join(items)
-        
-        status_display = "MISSING_ADDRESS" if missing_address else (status or "UNKNOWN")
-
-        evidence_lines = [
-            f"- **Employee:** `{emp}`",
-            f"- **Work mode:** {work_mode or '—'}",
-            f"- **Input address:** {addr_in or '—'}",
-            f"- **Resolved address:** {addr_fmt or '—'}",
-            f"- **Resolved location:** {', '.join([x for x in [locality, state, postcode, lga] if x]) or '—'}",
-            f"- **Pay period:** {pstart or '—'} → {pend or '—'}",
-            f"- **Holidays in period:** {hcount} ({labelled_holidays})",
-            f"- **Status:** `{status_display}`  |  **Severity:** **{sev}**  |  **Manual review:** `{manual}`  |  **Confidence:** `{confidence:.2f}`",
-        ]
-
-        # Optional evidence lines (only if present)
-        if geocode_quality:
-            evidence_lines.append(f"- **Geocode quality:** {geocode_quality}")
-        if lga_method:
-            evidence_lines.append(f"- **LGA resolution method:** {lga_method}")
-        if rules_applied:
-            evidence_lines.append(
-                f"- **Applicable regional holiday rules (full year):** {rules_applied}")
-        if replacement:
-            evidence_lines.append(f"- **Replacement applied:** {replacement}")
-
-        blocks.append(
-            "\n".join(
-                [
-                    # use status_display in the heading so MISSING_ADDRESS etc show up
-                    f"### {sev} — {status_display} — Employee {emp}",
-                    "",
-                    f"**Finding**: {msg}",
-                    "",
-                    "**Evidence**:",
-                    "",
-                    *evidence_lines,
-                    "",
-                    # show status_upper if present, otherwise fall back to status_raw
-                    f"**Why it matters**: {why}",
-                    "",
-                    f"**Recommended next action**: {next_action}",
-                    "",
-                ]
-            )
-        )
-
-
-    detailed_section = "\n".join(blocks) if blocks else "_No findings to display._"
-
-    inputs_list = "\n".join([f"- `{name}`" for name in (ctx.input_files or [])]) or "- (Not provided)"
-
-    prepared = fmt_date(ctx.prepared_as_at)
-    period_start = fmt_iso_date(summary.get("period_start"))
-    period_end = fmt_iso_date(summary.get("period_end"))
-
-    md_parts = [
+    yield from (
         "# Public Holiday Compliance Review",
         "",
         f"**Report prepared as at:** {prepared}  ",
@@ -546,17 +662,17 @@ def render_markdown(ctx: ReportContext, findings: List[Dict[str, Any]], summary:
         "",
         "## Data sources",
         "",
-        inputs_list,
+        *inputs_list,
         "",
         f"- Findings CSV: `{ctx.findings_csv.name}`",
         "",
         "## Executive Summary",
         "",
-        exec_bullets,
+        *exec_bullets,
         "",
         SEVERITY_EXPLANATION,
         "",
-        build_holiday_applicability_overview(findings),
+        build_holiday_applicability_overview(findings, summary),
         "",
         "## Scope & Methodology",
         "",
@@ -573,15 +689,129 @@ def render_markdown(ctx: ReportContext, findings: List[Dict[str, Any]], summary:
         "",
         "### Findings by severity",
         "",
-        _md_table(["Severity", "Count"], sev_rows),
+        *_md_table_lines(["Severity", "Count"], sev_rows),
         "",
         "### Findings by status",
         "",
-        _md_table(["Status", "Count"], status_rows),
+        *_md_table_lines(["Status", "Count"], status_rows),
         "",
         "## Detailed Findings",
         "",
-        detailed_section,
+    )
+
+    # Detailed findings: group by severity then status
+    findings_sorted = sorted(
+        (r if "_sev" in r else _prepare_finding(r) for r in findings),
+        key=_FINDING_SORT_KEY,
+    )
+
+    if not findings_sorted:
+        yield "_No findings to display._"
+
+    for r in findings_sorted:
+        (
+            status_raw, manual_raw, work_mode, addr_in, addr_fmt, state, postcode, locality, lga,
+            pstart, pend, hcount, holiday_dates_raw, date_labels, names, confidence,
+            geocode_quality, lga_method, rules_applied, replacement,
+        ) = _RENDER_FIELDS(r)
+
+        # keep a raw status for display (heading)
+        status_raw = _clean(status_raw) or "UNKNOWN"
+        manual = bool(manual_raw)
+        sev = r["_sev"]
+        emp = r["_emp_clean"]
+        work_mode = _clean(work_mode)
+        addr_in = _clean(addr_in)
+        addr_fmt = _clean(addr_fmt)
+        state = _clean(state)
+        postcode = _clean(postcode)
+        locality = _clean(locality)
+        lga = _clean(lga)
+        pstart = _clean(pstart)
+        pend = _clean(pend)
+        hcount = _safe_int(hcount, 0)
+        confidence = _as_float(confidence, 0.0)
+        geocode_quality = _clean(geocode_quality)
+        lga_method = _clean(lga_method)
+        rules_applied = _clean(rules_applied)
+        replacement = _clean(replacement)
+
+        # “Why it matters” and “Next action” – deterministic, status-driven
+                # “Why it matters” and “Next action” – deterministic, but now also address-aware
+        manual_review = manual_raw is True
+        status = status_raw.upper()
+        missing_address = not addr_in  # addr_in already computed above
+
+        if missing_address:
+            msg, why, next_action = _MISSING_ADDRESS_MESSAGES
+        else:
+            msg, why, next_action = (
+                _FINDING_MESSAGES.get((status, manual_review))
+                or _DEFAULT_FINDING_MESSAGES[manual_review]
+            )
+
+
+        # Build labelled holiday list for evidence (Name + Date)
+        labelled_holidays = "-"
+        if (holiday_dates_raw or "").strip():
+            items = []
+            for i, date_label in enumerate(date_labels):
+                if i < len(names) and names[i]:
+                    items.append(f"{names[i]} ({date_label})")
+                else:
+                    items.append(date_label)
+
+            labelled_holidays = "; ".join(items)
+        
+        status_display = "MISSING_ADDRESS" if missing_address else (status or "UNKNOWN")
+
+        loc_parts = []
+        if locality:
+            loc_parts.append(locality)
+        if state:
+            loc_parts.append(state)
+        if postcode:
+            loc_parts.append(postcode)
+        if lga:
+            loc_parts.append(lga)
+
+        yield from (
+            # use status_display in the heading so MISSING_ADDRESS etc show up
+            f"### {sev} — {status_display} — Employee {emp}",
+            "",
+            f"**Finding**: {msg}",
+            "",
+            "**Evidence**:",
+            "",
+            f"- **Employee:** `{emp}`",
+            f"- **Work mode:** {work_mode or '—'}",
+            f"- **Input address:** {addr_in or '—'}",
+            f"- **Resolved address:** {addr_fmt or '—'}",
+            f"- **Resolved location:** {', '.join(loc_parts) or '—'}",
+            f"- **Pay period:** {pstart or '—'} → {pend or '—'}",
+            f"- **Holidays in period:** {hcount} ({labelled_holidays})",
+            f"- **Status:** `{status_display}`  |  **Severity:** **{sev}**  |  **Manual review:** `{manual}`  |  **Confidence:** `{confidence:.2f}`",
+        )
+
+        # Optional evidence lines (only if present)
+        if geocode_quality:
+            yield f"- **Geocode quality:** {geocode_quality}"
+        if lga_method:
+            yield f"- **LGA resolution method:** {lga_method}"
+        if rules_applied:
+            yield f"- **Applicable regional holiday rules (full year):** {rules_applied}"
+        if replacement:
+            yield f"- **Replacement applied:** {replacement}"
+
+        yield from (
+            "",
+            f"**Why it matters**: {why}",
+            "",
+            f"**Recommended next action**: {next_action}",
+            "",
+        )
+
+    yield from (
         "",
         "## Limitations & Assumptions",
         "",
@@ -605,44 +835,39 @@ def render_markdown(ctx: ReportContext, findings: List[Dict[str, Any]], summary:
         "- `manual_review`: Indicates the record should be reviewed by a payroll administrator.",
         "- `confidence`: Numeric indicator supporting the resolution outcome (used for triage, not a compliance verdict).",
         "- `rules_applied` / `replacement_applied`: Evidence of regional rules influencing the holiday set.",
-    ]
-
-    return "\n".join(md_parts).strip() + "\n"
-
-def build_holiday_applicability_overview(findings: List[Dict[str, Any]]) -> str:
-    if not findings:
-        return "## Holiday applicability overview\n\nNo records were available.\n"
+    )
 
-    counts = [_as_int(r.get("holiday_count_in_period"), 0) for r in findings]
-    total = len(counts)
-    zero = sum(1 for c in counts if c == 0)
-    one = sum(1 for c in counts if c == 1)
-    two_plus = sum(1 for c in counts if c >= 2)
 
-    # Top holiday dates (frequency), optionally including names
-    # key = (date_str, name_str)
-    freq: Dict[Tuple[str, str], int] = {}
+def render_markdown(ctx: ReportContext, findings: List[Dict[str, Any]], summary: Dict[str, Any]) -> str:
+    return "\n".join(iter_markdown_lines(ctx, findings, summary)) + "\n"
 
-    for r in findings:
-        dates_str = (r.get("holiday_dates_in_period") or "").strip()
-        names_str = (r.get("holiday_names_in_period") or "").strip()
 
-        if not dates_str:
-            continue
+def build_holiday_applicability_overview(
+    findings: List[Dict[str, Any]],
+    summary: Optional[Dict[str, Any]] = None,
+) -> str:
+    if not findings:
+        return "## Holiday applicability overview\n\nNo records were available.\n"
 
-        date_parts = [x.strip() for x in dates_str.split(";") if x.strip()]
-        name_parts = [x.strip() for x in names_str.split(";") if x.strip()] if names_str else []
+    # Reuse the counts gathered by summarise() rather than re-walking findings
+    if summary is None or "holiday_counts" not in summary:
+        summary = summarise(findings)
 
-        for idx, dt in enumerate(date_parts):
-            name = name_parts[idx] if idx < len(name_parts) else ""
-            key = (dt, name)
-            freq[key] = freq.get(key, 0) + 1
+    counts: Counter[int] = summary["holiday_counts"]
+    freq: Counter[Tuple[str, str]] = summary["holiday_date_freq"]
 
-    # Sort by frequency desc, then by date, then by name
-    top = sorted(
+    total = len(findings)
+    zero = counts[0]
+    one = counts[1]
+    two_plus = sum(n for c, n in counts.items() if c >= 2)
+
+    # Top 10 by frequency desc, then by date, then by name
+    # (most_common() would break ties by insertion order instead)
+    top = heapq.nsmallest(
+        10,
         freq.items(),
         key=lambda kv: (-kv[1], kv[0][0], kv[0][1])
-    )[:10]
+    )
 
     lines = [
         "## Holiday applicability overview",
@@ -670,7 +895,7 @@ def build_holiday_applicability_overview(findings: List[Dict[str, Any]]) -> str:
         ]
         for (d, name), n in top:
             # Format ISO date -> 01 Jan 2025 style when possible
-            disp_date = _fmt_iso_to_long(d) if len(d) == 10 and d[4] == "-" else d
+            disp_date = _holiday_date_label(d)
             disp_name = name or "—"
             lines.append(f"| {disp_date} | {disp_name} | {n} |")
         lines.append("")
@@ -678,10 +903,21 @@ def build_holiday_applicability_overview(findings: List[Dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
-def write_report_markdown(md: str, output_dir: Path) -> Path:
-    output_dir.mkdir(parents=True, exist_ok=True)
+def write_report_markdown(md: str | Iterable[str], output_dir: Path) -> Path:
+    """Write the report; `md` is either the full text or an iterable of lines (streamed)."""
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True, exist_ok=True)
     out_path = output_dir / "public_holiday_compliance_report.md"
-    out_path.write_text(md, encoding="utf-8")
+    if isinstance(md, str):
+        # One encode pass, written as-is (no text-layer buffering/newline translation)
+        out_path.write_bytes(md.encode("utf-8"))
+        return out_path
+
+    with out_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        write = f.write
+        for line in md:
+            write(line)
+            write("\n")
     return out_path
 
 
@@ -704,5 +940,6 @@ def generate_public_holiday_report(
     )
     findings = load_findings(findings_csv)
     summary = summarise(findings)
-    md = render_markdown(ctx, findings, summary)
-    return write_report_markdown(md, output_dir)
+    # Streamed straight to disk; the full report string is never built
+    lines = iter_markdown_lines(ctx, findings, summary)
+    return write_report_markdown(lines, output_dir)
@@ -11,11 +11,19 @@ This uses the same reporting functions as streamlit_app.py, so outputs stay alig
 
 from __future__ import annotations
 
+import argparse
 import csv
+import os
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
 
+from . import geocode_google
 from .service import lookup_address_info
 from .reporting.public_holiday_report_md import generate_public_holiday_report
 from .reporting.html_builder import build_html_and_pdf
@@ -32,6 +40,48 @@ DEFAULT_INPUT_CSV = BATCH_INPUTS_DIR / "mixed_example.csv"
 PH_OUTPUT_DIR = BASE_DIR / "outputs" / "public_holiday_run"
 FINDINGS_CSV_PATH = PH_OUTPUT_DIR / "payroll_holiday_check_results.csv"
 
+# Env var overriding the rows processed concurrently (geocoding is still
+# rate-limited in geocode_google). Unset = sized from the row count; read by
+# _auto_workers() at run time so a bad value can't break importing this module.
+BATCH_WORKERS_ENV = "PH_BATCH_WORKERS"
+
+# Below this many rows a thread pool costs more than it saves
+SERIAL_ROW_THRESHOLD = 200
+MAX_BATCH_WORKERS = 32
+
+# Rows in flight per worker while streaming the input CSV
+ROWS_IN_FLIGHT_PER_WORKER = 4
+
+# Read/write buffer for the batch CSVs (fewer syscalls on large payroll extracts)
+CSV_BUFFER_SIZE = 1 << 20
+
+# Output columns: every key _process_row() can emit, in report order
+OUTPUT_FIELDS: Tuple[str, ...] = (
+    "row",
+    "employee_id",
+    "work_mode",
+    "input_address",
+    "formatted_address",
+    "state",
+    "postcode",
+    "locality",
+    "lga",
+    "pay_period_start",
+    "pay_period_end",
+    "holiday_count_in_period",
+    "holiday_dates_in_period",
+    "holiday_names_in_period",
+    "status",
+    "manual_review",
+    "confidence",
+    "audit_message",
+    "geocode_quality",
+    "lga_resolution_method",
+    "rules_applied",
+    "replacement_applied",
+    "error",
+)
+
 
 def _parse_iso_date(value: str | None) -> Optional[date]:
     """Parse a simple YYYY-MM-DD string into a date, or return None."""
@@ -46,18 +96,219 @@ def _parse_iso_date(value: str | None) -> Optional[date]:
         return None
 
 
+def _auto_workers(n_rows: int) -> int:
+    """
+    Worker count for a batch of n_rows: PH_BATCH_WORKERS if set to a positive
+    integer, else serial for small inputs, then ~1 per 64 rows (4..32).
+    """
+    env_workers = os.getenv(BATCH_WORKERS_ENV, "").strip()
+    if env_workers:
+        try:
+            n = int(env_workers)
+        except ValueError:
+            n = 0
+        if n > 0:
+            return n
+        warnings.warn(
+            f"Ignoring {BATCH_WORKERS_ENV}={env_workers!r} (expected a positive integer); "
+            "sizing workers from the row count",
+            stacklevel=2,
+        )
+
+    if n_rows < SERIAL_ROW_THRESHOLD:
+        return 1
+    return min(MAX_BATCH_WORKERS, max(4, n_rows // 64 + 1))
+
+
 # ---------- Core batch runner ----------
 
+def _result_fields(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Output columns derived from one lookup_address_info() result."""
+    holidays_in_period = r.get("holidays_in_period") or []
+    pay_period = r.get("pay_period") or {}
+
+    # Map date -> name (first name wins if duplicates), then sort the
+    # unique dates once and align names to them
+    names_by_date: Dict[str, str] = {}
+    for h in holidays_in_period:
+        d = h.get("date")
+        if d and d not in names_by_date:
+            names_by_date[d] = h.get("name") or h.get("localName", "") or ""
+
+    dates = sorted(names_by_date)
+    names = [names_by_date[d] for d in dates]
+
+    return {
+        "formatted_address": r.get("formatted_address", ""),
+        "state": r.get("state"),
+        "postcode": r.get("postcode"),
+        "locality": r.get("locality"),
+        "lga": r.get("lga"),
+        "pay_period_start": pay_period.get("start") or "",
+        "pay_period_end": pay_period.get("end") or "",
+        "holiday_count_in_period": r.get("holiday_count_in_period"),
+        "holiday_dates_in_period": "; ".join(dates),
+        "holiday_names_in_period": "; ".join(names),
+        "status": r.get("status"),
+        "manual_review": r.get("manual_review"),
+        "confidence": r.get("confidence"),
+        "audit_message": r.get("audit_message"),
+        "geocode_quality": r.get("geocode_quality") or r.get("location_type"),
+        "lga_resolution_method": r.get("lga_resolution_method"),
+        "rules_applied": "; ".join(r.get("rules_applied", [])),
+        "replacement_applied": r.get("replacement_applied"),
+    }
+
+
+class _BatchLookupMemo:
+    """
+    lookup_address_info() memoised for one batch run.
+
+    Batches repeat the same office/home address many times: each
+    (normalised address, year, pay period) is looked up once, and concurrent
+    rows with the same key wait for the first lookup instead of repeating it.
+    The memo holds the derived output columns (_result_fields), so rows sharing
+    a key also share that work.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: Dict[Tuple[str, int, Optional[date], Optional[date]], Future] = {}
+
+    def __call__(
+        self, address: str, year: int, start: Optional[date], end: Optional[date]
+    ) -> Dict[str, Any]:
+        key = (" ".join(address.lower().split()), year, start, end)
+        with self._lock:
+            fut = self._results.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._results[key] = Future()
+
+        if owner:
+            try:
+                fut.set_result(
+                    _result_fields(
+                        lookup_address_info(
+                            address, year, start=start, end=end, include_audit_json=False
+                        )
+                    )
+                )
+            except BaseException as e:
+                fut.set_exception(e)
+        return fut.result()
+
+
+def _process_row(
+    idx: int,
+    row: Dict[str, Any],
+    year: int,
+    period_start: Optional[date],
+    period_end: Optional[date],
+    lookup: _BatchLookupMemo,
+) -> Dict[str, Any]:
+    """Enrich one input row (same output shape as the Streamlit batch)."""
+    employee_id = row.get("employee_id", None)
+
+    # Normalise work_mode
+    work_mode_raw = row.get("work_mode", "")
+    work_mode = str(work_mode_raw).upper().strip()
+
+    if work_mode == "OFFICE":
+        address = row.get("office_address", "")
+    elif work_mode == "HOME":
+        address = row.get("home_address", "")
+    else:
+        # Match Streamlit behaviour for invalid work_mode
+        return {
+            "row": idx,
+            "employee_id": employee_id,
+            "error": "Invalid work_mode (must be OFFICE or HOME)",
+        }
+
+    if not isinstance(address, str) or not address.strip():
+        # Match Streamlit behaviour for missing address
+        return {
+            "row": idx,
+            "employee_id": employee_id,
+            "work_mode": work_mode,
+            "error": "Missing address for work_mode",
+        }
+
+    # Row overrides (optional) – same semantics as Streamlit batch
+    row_year = row.get("year", None)
+    if row_year is None or str(row_year).strip() == "":
+        effective_year = year
+    else:
+        try:
+            effective_year = int(row_year)
+        except (TypeError, ValueError):
+            effective_year = year
+
+    # Pay period overrides
+    row_start_raw = row.get("start_date", None)
+    row_end_raw = row.get("end_date", None)
+
+    start = _parse_iso_date(row_start_raw) or period_start
+    end = _parse_iso_date(row_end_raw) or period_end
+
+    try:
+        fields = lookup(address.strip(), effective_year, start, end)
+        return {
+            "row": idx,
+            "employee_id": employee_id,
+            "work_mode": work_mode,
+            "input_address": address.strip(),
+            **fields,
+        }
+    except Exception as e:
+        # Match Streamlit error shape
+        return {
+            "row": idx,
+            "employee_id": employee_id,
+            "work_mode": work_mode,
+            "input_address": address.strip(),
+            "error": str(e),
+        }
+
+
+def _bounded_map(
+    ex: ThreadPoolExecutor,
+    fn: Callable[[Any], Dict[str, Any]],
+    items: Iterable[Any],
+    max_pending: int,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Like ex.map(), but pulls from `items` lazily with at most max_pending
+    futures outstanding, so a large input is never fully materialised.
+    Results are yielded in input order.
+    """
+    pending: Deque[Future] = deque()
+    for item in items:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(ex.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
+
+
 def run_public_holiday_batch(
     input_csv: Path = DEFAULT_INPUT_CSV,
     output_csv: Path = FINDINGS_CSV_PATH,
     year: Optional[int] = None,
     period_start: Optional[date] = None,
     period_end: Optional[date] = None,
+    workers: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    log: Optional[Callable[[str], None]] = None,
 ) -> Path:
     """
     Run the Public Holiday batch using a CSV shaped like the Streamlit template.
 
+    `workers` overrides the row concurrency (default: PH_BATCH_WORKERS env var,
+    else chosen from the row count); `max_workers` caps whichever is used.
+    `log`, if given, receives a progress line (row and worker counts); silent by default.
+
     Columns expected (same as template):
     - employee_id
     - office_address
@@ -73,163 +324,141 @@ def run_public_holiday_batch(
     if not input_csv.exists():
         raise FileNotFoundError(f"Input CSV not found: {input_csv}")
 
-    PH_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_csv.parent.mkdir(parents=True, exist_ok=True)
+
+    # Cheap counting pass (no dicts built) so the pool can be sized up front.
+    # Blank lines are skipped, as DictReader skips them below.
+    with input_csv.open("r", newline="", encoding="utf-8-sig", buffering=CSV_BUFFER_SIZE) as f_in:
+        rows = csv.reader(f_in)
+        next(rows, None)  # header
+        n_rows = sum(1 for row in rows if row)
+
+    lookup = _BatchLookupMemo()
+
+    def _one(item: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+        idx, row = item
+        return _process_row(idx, row, year, period_start, period_end, lookup)
 
-    # Read all rows once
-    with input_csv.open("r", newline="", encoding="utf-8-sig") as f_in:
+    # Rows are streamed from the input straight to the output CSV, so memory
+    # stays bounded by the number of rows in flight rather than the file size.
+    with input_csv.open("r", newline="", encoding="utf-8-sig", buffering=CSV_BUFFER_SIZE) as f_in, \
+            output_csv.open("w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f_out:
         reader = csv.DictReader(f_in)
-        rows: List[Dict[str, Any]] = list(reader)
-        original_fieldnames = reader.fieldnames or []
 
-    if not rows:
-        # still write an empty file with original headers for consistency
-        with output_csv.open("w", newline="", encoding="utf-8") as f_out:
-            writer = csv.DictWriter(f_out, fieldnames=original_fieldnames)
+        if n_rows == 0:
+            # still write an empty file with original headers for consistency
+            writer = csv.DictWriter(f_out, fieldnames=reader.fieldnames or [])
             writer.writeheader()
-        return output_csv
+            return output_csv
 
-    enriched_rows: List[Dict[str, Any]] = []
+        n_workers = workers or _auto_workers(n_rows)
+        if max_workers:
+            n_workers = min(n_workers, max_workers)
+        if log is not None:
+            log(f"Processing {n_rows} row(s) from {input_csv.name} with {n_workers} worker(s)")
 
-    for idx, row in enumerate(rows):
-        employee_id = row.get("employee_id", None)
-
-        # Normalise work_mode
-        work_mode_raw = row.get("work_mode", "")
-        work_mode = str(work_mode_raw).upper().strip()
+        writer = csv.DictWriter(f_out, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
 
-        if work_mode == "OFFICE":
-            address = row.get("office_address", "")
-        elif work_mode == "HOME":
-            address = row.get("home_address", "")
-        else:
-            # Match Streamlit behaviour for invalid work_mode
-            enriched_rows.append({
-                "row": idx,
-                "employee_id": employee_id,
-                "error": "Invalid work_mode (must be OFFICE or HOME)",
-            })
-            continue
-
-        if not isinstance(address, str) or not address.strip():
-            # Match Streamlit behaviour for missing address
-            enriched_rows.append({
-                "row": idx,
-                "employee_id": employee_id,
-                "work_mode": work_mode,
-                "error": "Missing address for work_mode",
-            })
-            continue
-
-        # Row overrides (optional) – same semantics as Streamlit batch
-        row_year = row.get("year", None)
-        if row_year is None or str(row_year).strip() == "":
-            effective_year = year
+        if n_workers <= 1:
+            for item in enumerate(reader):
+                writer.writerow(_one(item))
         else:
-            try:
-                effective_year = int(row_year)
-            except (TypeError, ValueError):
-                effective_year = year
+            # Rows are independent and dominated by blocking HTTP, so fan them
+            # out over threads; results come back in input order.
+            with ThreadPoolExecutor(max_workers=n_workers) as ex:
+                for rec in _bounded_map(
+                    ex, _one, enumerate(reader), n_workers * ROWS_IN_FLIGHT_PER_WORKER
+                ):
+                    writer.writerow(rec)
 
-        # Pay period overrides
-        row_start_raw = row.get("start_date", None)
-        row_end_raw = row.get("end_date", None)
+    return output_csv
 
-        start = _parse_iso_date(row_start_raw) or period_start
-        end = _parse_iso_date(row_end_raw) or period_end
 
-        try:
-            r = lookup_address_info(address.strip(), effective_year, start=start, end=end)
-
-            holidays_in_period = r.get("holidays_in_period") or []
-            pay_period = r.get("pay_period") or {}
-
-            # Build a sorted list of unique holiday dates (strings)
-            dates = sorted({h.get("date") for h in holidays_in_period if h.get("date")})
-
-            # Map date -> name (first name wins if duplicates)
-            names_by_date: Dict[str, str] = {}
-            for h in holidays_in_period:
-                d = h.get("date")
-                if not d:
-                    continue
-                n = h.get("name") or h.get("localName", "") or ""
-                names_by_date.setdefault(d, n)
-
-            # Names aligned to the sorted dates list
-            names = [names_by_date.get(d, "") for d in dates]
-
-            enriched_rows.append({
-                "row": idx,
-                "employee_id": employee_id,
-                "work_mode": work_mode,
-                "input_address": address.strip(),
-
-                "formatted_address": r.get("formatted_address", ""),
-                "state": r.get("state"),
-                "postcode": r.get("postcode"),
-                "locality": r.get("locality"),
-                "lga": r.get("lga"),
-                "pay_period_start": pay_period.get("start") or "",
-                "pay_period_end": pay_period.get("end") or "",
-                "holiday_count_in_period": r.get("holiday_count_in_period"),
-                "holiday_dates_in_period": "; ".join(dates),
-                "holiday_names_in_period": "; ".join(names),
-                "status": r.get("status"),
-                "manual_review": r.get("manual_review"),
-                "confidence": r.get("confidence"),
-                "audit_message": r.get("audit_message"),
-                "geocode_quality": r.get("geocode_quality") or r.get("location_type"),
-                "lga_resolution_method": r.get("lga_resolution_method"),
-                "rules_applied": "; ".join(r.get("rules_applied", [])),
-                "replacement_applied": r.get("replacement_applied"),
-            })
-        except Exception as e:
-            # Match Streamlit error shape
-            enriched_rows.append({
-                "row": idx,
-                "employee_id": employee_id,
-                "work_mode": work_mode,
-                "input_address": address.strip(),
-                "error": str(e),
-            })
-
-    # --- Write output CSV ---
-    if enriched_rows:
-        # Union of all keys across rows, like pandas DataFrame would do
-        fieldname_set = set()
-        for rec in enriched_rows:
-            fieldname_set.update(rec.keys())
-        fieldnames: List[str] = list(fieldname_set)
-    else:
-        fieldnames = original_fieldnames
+def _batch_output_names(input_csvs: List[Path]) -> List[str]:
+    """
+    Per-input output folder names: the input's stem, prefixed with its
+    1-based position when another input has the same stem (a/staff.csv and
+    b/staff.csv -> 1_staff, 2_staff) so their outputs don't overwrite each other.
+    """
+    stem_counts: Dict[str, int] = {}
+    for p in input_csvs:
+        stem_counts[p.stem] = stem_counts.get(p.stem, 0) + 1
+    return [
+        p.stem if stem_counts[p.stem] == 1 else f"{i}_{p.stem}"
+        for i, p in enumerate(input_csvs, start=1)
+    ]
 
-    with output_csv.open("w", newline="", encoding="utf-8") as f_out:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(enriched_rows)
 
-    return output_csv
+def _init_batch_process(geocode_max_qps: float) -> None:
+    """ProcessPoolExecutor initializer: this process's share of the Google request budget."""
+    geocode_google.GEOCODE_MAX_QPS = geocode_max_qps
 
 
-# ---------- CLI entry point ----------
+def run_public_holiday_batches(
+    input_csvs: List[Path],
+    output_dir: Path = PH_OUTPUT_DIR,
+    year: Optional[int] = None,
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+) -> List[Path]:
+    """
+    Run several input CSVs in parallel, one process per file.
+
+    Each file's findings go to output_dir/<input stem>/payroll_holiday_check_results.csv
+    (see _batch_output_names() for inputs sharing a stem).
+    Processes keep their own in-memory caches but share the SQLite geocode cache
+    (WAL mode), so an address geocoded by one file is a cache hit for the others.
+
+    The geocode rate limit is per process, so GEOCODE_MAX_QPS is split evenly
+    between the processes, and each gets an equal share of MAX_BATCH_WORKERS
+    threads, keeping the totals the same as for a single file.
+    """
+    output_csvs = [
+        output_dir / name / FINDINGS_CSV_PATH.name for name in _batch_output_names(input_csvs)
+    ]
+    if len(input_csvs) <= 1:
+        return [
+            run_public_holiday_batch(i, o, year, period_start, period_end)
+            for i, o in zip(input_csvs, output_csvs)
+        ]
+
+    n_procs = min(len(input_csvs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=n_procs,
+        initializer=_init_batch_process,
+        initargs=(geocode_google.GEOCODE_MAX_QPS / n_procs,),
+    ) as ex:
+        return list(
+            ex.map(
+                run_public_holiday_batch,
+                input_csvs,
+                output_csvs,
+                repeat(year),
+                repeat(period_start),
+                repeat(period_end),
+                repeat(None),
+                repeat(max(1, MAX_BATCH_WORKERS // n_procs)),
+            )
+        )
 
-def main() -> None:
-    print(f"Running Public Holiday batch using: {DEFAULT_INPUT_CSV}")
-    findings_csv = run_public_holiday_batch()
-    print(f"Wrote enriched results to: {findings_csv}")
 
+# ---------- CLI entry point ----------
+
+def _write_reports(findings_csv: Path, output_dir: Path, input_name: str) -> None:
+    """Markdown + HTML (+ best-effort PDF) reports for one findings CSV."""
     # Generate Markdown report from findings CSV (same as Streamlit)
     report_md_path = generate_public_holiday_report(
         findings_csv=findings_csv,
-        output_dir=PH_OUTPUT_DIR,
-        input_files=[DEFAULT_INPUT_CSV.name],
+        output_dir=output_dir,
+        input_files=[input_name],
     )
     print(f"Wrote Markdown report to: {report_md_path}")
 
     # Build HTML (and best-effort PDF) in the same output folder
     html_path, pdf_path = build_html_and_pdf(
         md_path=report_md_path,
-        out_dir=PH_OUTPUT_DIR,
+        out_dir=output_dir,
         title="Public Holiday Compliance Review",
     )
 
@@ -240,5 +469,30 @@ def main() -> None:
         print("PDF generation skipped (WeasyPrint not available).")
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Public Holiday batch check.")
+    parser.add_argument(
+        "input_csvs",
+        nargs="*",
+        type=Path,
+        help=f"Input CSV(s) shaped like the batch template (default: {DEFAULT_INPUT_CSV})",
+    )
+    args = parser.parse_args()
+    input_csvs: List[Path] = args.input_csvs or [DEFAULT_INPUT_CSV]
+
+    if len(input_csvs) == 1:
+        print(f"Running Public Holiday batch using: {input_csvs[0]}")
+        findings_csv = run_public_holiday_batch(input_csvs[0], log=print)
+        print(f"Wrote enriched results to: {findings_csv}")
+        _write_reports(findings_csv, PH_OUTPUT_DIR, input_csvs[0].name)
+        return
+
+    print(f"Running Public Holiday batch for {len(input_csvs)} files")
+    findings_csvs = run_public_holiday_batches(input_csvs)
+    for input_csv, findings_csv in zip(input_csvs, findings_csvs):
+        print(f"Wrote enriched results for {input_csv.name} to: {findings_csv}")
+        _write_reports(findings_csv, findings_csv.parent, input_csv.name)
+
+
 if __name__ == "__main__":
     main()
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import functools
 import json
+import re
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from .geocode_google import geocode_address
-from .lga_lookup import lga_from_latlon
+from .lga_lookup import lga_and_state_from_latlon, lga_from_latlon
 
 from src.address_holidays.regional_rules import (
-    load_regional_rules,
+    RegionalRuleIndex,
+    has_address_keyed_rules,
+    load_regional_rule_index,
     match_regional_rules,
     merge_holidays,
 )
@@ -16,6 +20,7 @@ from src.address_holidays.regional_rules import (
 from src.address_holidays.holidays_au import (
     get_au_public_holidays,
     filter_holidays_for_subdivision,
+    holidays_cache_bucket,
 )
 
 # ----------------------------
@@ -29,6 +34,48 @@ STATUS_RULES_MISSING = "RULES_MISSING"
 STATUS_UPSTREAM_UNAVAILABLE = "UPSTREAM_UNAVAILABLE"
 STATUS_ERROR = "ERROR"
 
+# "lat,lon" inputs (e.g. "-37.8136, 144.9631") skip the geocoder entirely
+_COORDINATES_RE = re.compile(r"^\s*(-?\d+\.\d+)\s*,\s*(-?\d+\.\d+)\s*$")
+
+# Confidence cap for coordinate inputs whose state has POSTCODE/LOCALITY rules
+# (which can't be evaluated without a postcode/locality): below the
+# LOW_CONFIDENCE threshold, so the row goes to manual review.
+COORDINATES_UNMATCHED_RULES_CONFIDENCE = 0.5
+
+
+def _parse_coordinates(address: str) -> Optional[Tuple[float, float]]:
+    """(lat, lon) if `address` is a decimal coordinate pair, else None."""
+    m = _COORDINATES_RE.match(address)
+    if m is None:
+        return None
+    lat, lon = float(m.group(1)), float(m.group(2))
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    return lat, lon
+
+
+def _geo_from_coordinates(address: str, lat: float, lon: float) -> Dict[str, Any]:
+    """
+    Geocode-shaped result for a coordinate input; LGA + state come from the polygons.
+
+    There is no postcode/locality, so only LGA-keyed regional rules can match;
+    lookup_address_info() flags the result when the state has other rules.
+    """
+    lga, state = lga_and_state_from_latlon(lat=lat, lon=lon)
+    return {
+        "formatted_address": f"{lat}, {lon}",
+        "lat": lat,
+        "lon": lon,
+        "state": state,
+        "postcode": None,
+        "locality": None,
+        "lga": lga,
+        "geocode_query_used": address,
+        "is_fallback_match": False,
+        # Exact point supplied by the caller
+        "location_type": "ROOFTOP",
+    }
+
 
 def _confidence_from_geocode_quality(q: str | None) -> float:
     """Coarse confidence mapping; good enough for v1 audit trail."""
@@ -48,6 +95,83 @@ def _confidence_from_geocode_quality(q: str | None) -> float:
     return 0.5
 
 
+def _base_holidays_for_state(year: int, state: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    National + state holidays for (year, state), normalised.
+
+    Only called by _resolve_holidays(), which caches the result per location.
+    """
+    holidays = [dict(h) for h in filter_holidays_for_subdivision(get_au_public_holidays(year), state)]
+    for h in holidays:
+        h.setdefault("scope", "FULL_DAY")
+        h.setdefault("is_regional", False)
+        h.setdefault("source", "Nager.Date")
+        h.setdefault("applies_to", "ALL")
+    return tuple(holidays)
+
+
+class _ResolvedHolidays(NamedTuple):
+    holidays: Tuple[Dict[str, Any], ...]
+    rules_applied: Tuple[str, ...]
+    regional_holidays_applied: Tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_holidays(
+    rules: RegionalRuleIndex,
+    year: int,
+    state: Optional[str],
+    lga: str,
+    postcode: Optional[str],
+    locality: Optional[str],
+    holidays_bucket: int,
+) -> _ResolvedHolidays:
+    """
+    Base + regional holidays for one resolved location (steps 3 and 4).
+
+    Keyed on the rule index itself, so an edited rules file (new index) misses,
+    and on holidays_cache_bucket(), so it expires with the Nager.Date fetch.
+    Shared between calls: copy the holiday dicts before handing them out.
+    """
+    holidays = list(_base_holidays_for_state(year, (state or "").upper()))
+
+    matched_rules = match_regional_rules(
+        rules,
+        state=state,
+        lga=lga,
+        postcode=postcode,
+        locality=locality,
+        include_restricted=False,
+    )
+
+    # Track rule ids/names applied for audit trail
+    applied = []
+    for r in matched_rules:
+        # try common attributes; fall back to date-name string
+        rule_id = getattr(r, "rule_id", None) or getattr(r, "id", None)
+        if rule_id:
+            applied.append(str(rule_id))
+        else:
+            r_date = getattr(r, "date", None)
+            r_name = getattr(r, "name", None)
+            if r_date and r_name:
+                applied.append(f"{r_date.isoformat()}:{r_name}")
+
+    return _ResolvedHolidays(
+        holidays=tuple(merge_holidays(holidays, matched_rules)),
+        rules_applied=tuple(applied),
+        regional_holidays_applied=tuple(
+            f"{getattr(r, 'date', None).isoformat()} - {getattr(r, 'name', '')}".strip()
+            for r in matched_rules
+            if getattr(r, "date", None) is not None
+        ),
+    )
+
+
+def _audit_json(audit: Dict[str, Any]) -> str:
+    return json.dumps(audit, ensure_ascii=False)
+
+
 def _init_audit(address: str) -> Dict[str, Any]:
     return {
         "status": STATUS_OK,
@@ -79,20 +203,34 @@ def lookup_address_info(
     year: int,
     start: date | None = None,
     end: date | None = None,
+    include_audit_json: bool = True,
 ):
+    """
+    Geocode `address`, resolve its LGA and return the applicable holidays plus
+    a flat audit trail.
+
+    `audit_json` (the audit fields serialised as one string) is only built when
+    include_audit_json is true; batch callers that use the flat fields pass
+    False and get None.
+    """
     audit = _init_audit(address)
 
     geo: Dict[str, Any] = {}
     lga: Optional[str] = None
     holidays: List[Dict[str, Any]] = []
     holidays_in_period: List[Dict[str, Any]] = []
-    matched_rules: List[Any] = []
+    regional_applied: List[str] = []
 
     try:
         # ----------------------------
         # 1) Geocode
         # ----------------------------
-        geo = geocode_address(address) or {}
+        coords = _parse_coordinates(address)
+        if coords is not None:
+            geo = _geo_from_coordinates(address, *coords)
+            audit["geocode_provider"] = "coordinates"
+        else:
+            geo = geocode_address(address) or {}
 
         # Common patterns: either raises, or returns fields like {"ok": False, "error": "..."}
         if geo.get("ok") is False or geo.get("status") in {"ZERO_RESULTS", "NOT_FOUND"}:
@@ -119,7 +257,7 @@ def lookup_address_info(
                 "regional_holidays_applied": [],
                 # audit (flat + json)
                 **audit,
-                "audit_json": json.dumps(audit, ensure_ascii=False),
+                "audit_json": _audit_json(audit) if include_audit_json else None,
             }
 
         # geocode quality (try a few likely keys)
@@ -156,13 +294,14 @@ def lookup_address_info(
                 "holiday_count_in_period": 0,
                 "regional_holidays_applied": [],
                 **audit,
-                "audit_json": json.dumps(audit, ensure_ascii=False),
+                "audit_json": _audit_json(audit) if include_audit_json else None,
             }
 
         # ----------------------------
         # 2) LGA lookup (lat/lon → polygon)
         # ----------------------------
-        lga = lga_from_latlon(lat=lat, lon=lon)
+        # Coordinate inputs already resolved their LGA alongside the state
+        lga = geo["lga"] if "lga" in geo else lga_from_latlon(lat=lat, lon=lon)
         audit["lga_resolution_method"] = "polygon"
 
         if not lga:
@@ -192,52 +331,35 @@ def lookup_address_info(
                 "holiday_count_in_period": 0,
                 "regional_holidays_applied": [],
                 **audit,
-                "audit_json": json.dumps(audit, ensure_ascii=False),
+                "audit_json": _audit_json(audit) if include_audit_json else None,
             }
 
         # ----------------------------
-        # 3) Base holidays
-        # ----------------------------
-        all_holidays = get_au_public_holidays(year)
-        state = (geo.get("state") or "").upper()
-        holidays = filter_holidays_for_subdivision(all_holidays, state)
-
-        # Normalise base holidays (optional but nice)
-        for h in holidays:
-            h.setdefault("scope", "FULL_DAY")
-            h.setdefault("is_regional", False)
-            h.setdefault("source", "Nager.Date")
-            h.setdefault("applies_to", "ALL")
-
-        # ----------------------------
-        # 4) Apply regional holiday rules
+        # 3+4) Base holidays + regional holiday rules
         # ----------------------------
-        rules = load_regional_rules(year)
-
-        matched_rules = match_regional_rules(
-            rules,
-            state=geo.get("state"),
-            lga=lga,
-            postcode=geo.get("postcode"),
-            locality=geo.get("locality"),
-            include_restricted=False,
+        # Computed once per location (rows sharing an office hit the cache);
+        # copied because the lists are returned to the caller
+        rule_index = load_regional_rule_index(year)
+        resolved = _resolve_holidays(
+            rule_index,
+            year,
+            geo.get("state"),
+            lga,
+            geo.get("postcode"),
+            geo.get("locality"),
+            holidays_cache_bucket(),
         )
-
-        # Track rule ids/names applied for audit trail
-        applied = []
-        for r in matched_rules:
-            # try common attributes; fall back to date-name string
-            rule_id = getattr(r, "rule_id", None) or getattr(r, "id", None)
-            if rule_id:
-                applied.append(str(rule_id))
-            else:
-                r_date = getattr(r, "date", None)
-                r_name = getattr(r, "name", None)
-                if r_date and r_name:
-                    applied.append(f"{r_date.isoformat()}:{r_name}")
-        audit["rules_applied"] = applied
-
-        holidays = merge_holidays(holidays, matched_rules)
+        holidays = [dict(h) for h in resolved.holidays]
+        audit["rules_applied"] = list(resolved.rules_applied)
+        regional_applied = list(resolved.regional_holidays_applied)
+
+        # Coordinate inputs carry no postcode/locality, so the state's
+        # POSTCODE/LOCALITY rules were never evaluated: don't report that as OK
+        locality_rules_skipped = coords is not None and has_address_keyed_rules(
+            rule_index, geo.get("state")
+        )
+        if locality_rules_skipped:
+            audit["confidence"] = min(audit["confidence"], COORDINATES_UNMATCHED_RULES_CONFIDENCE)
 
        # If we only have very approximate geocode quality, downgrade outcome to LOW_CONFIDENCE
         # (GEOMETRIC_CENTER and better are treated as acceptable for this review.)
@@ -253,9 +375,12 @@ def lookup_address_info(
         # 5) Pay-period filtering
         # ----------------------------
         if start and end:
+            # Holiday dates are YYYY-MM-DD strings, which order the same as the
+            # dates themselves, so compare as strings instead of parsing each one.
+            start_iso, end_iso = start.isoformat(), end.isoformat()
             holidays_in_period = [
                 h for h in holidays
-                if start <= date.fromisoformat(h["date"]) <= end
+                if start_iso <= h["date"] <= end_iso
             ]
         else:
             holidays_in_period = holidays
@@ -265,6 +390,11 @@ def lookup_address_info(
         # ----------------------------
         if audit["status"] == STATUS_OK:
             audit["audit_message"] = "Resolved via geocode coordinates and LGA polygon match; holidays calculated with regional rules."
+        elif audit["status"] == STATUS_LOW_CONFIDENCE and locality_rules_skipped:
+            audit["audit_message"] = (
+                "Resolved from coordinates: only LGA-keyed regional rules were evaluated "
+                "(no postcode/locality for this state's postcode/locality rules); manual review recommended."
+            )
         elif audit["status"] == STATUS_LOW_CONFIDENCE:
             audit["audit_message"] = "Result generated but geocode confidence is low; manual review recommended."
         elif audit["status"] == STATUS_RULES_MISSING:
@@ -305,7 +435,7 @@ def lookup_address_info(
             "holiday_count_in_period": 0,
             "regional_holidays_applied": [],
             **audit,
-            "audit_json": json.dumps(audit, ensure_ascii=False),
+            "audit_json": _audit_json(audit) if include_audit_json else None,
         }
 
     
@@ -335,7 +465,7 @@ def lookup_address_info(
             "holiday_count_in_period": 0,
             "regional_holidays_applied": [],
             **audit,
-            "audit_json": json.dumps(audit, ensure_ascii=False),
+            "audit_json": _audit_json(audit) if include_audit_json else None,
         }
 
     _finalise_audit(audit)
@@ -355,12 +485,8 @@ def lookup_address_info(
         },
         "holidays_in_period": holidays_in_period,
         "holiday_count_in_period": len(holidays_in_period) if holidays_in_period is not None else None,
-        "regional_holidays_applied": [
-            f"{getattr(r, 'date', None).isoformat()} - {getattr(r, 'name', '')}".strip()
-            for r in matched_rules
-            if getattr(r, "date", None) is not None
-        ],
+        "regional_holidays_applied": regional_applied,
         # audit (flat + json)
         **audit,
-        "audit_json": json.dumps(audit, ensure_ascii=False),
+        "audit_json": _audit_json(audit) if include_audit_json else None,
     }
@@ -1,14 +1,245 @@
+import csv
+import importlib.util
+import io
+import os
+import statistics
+import time
+from operator import itemgetter
 import streamlit as st
 import pandas as pd
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from src.address_holidays.service import lookup_address_info
 from src.address_holidays.reporting.public_holiday_report_md import (
+    FINDING_FIELDS,
     generate_public_holiday_report,
 )
 from src.address_holidays.reporting.html_builder import build_html_and_pdf
 
+YEAR_OPTIONS = (2024, 2025, 2026, 2027)
+
+TEMPLATE_CSV_BYTES = b"""employee_id,office_address,home_address,work_mode,year,start_date,end_date
+E001,"Federation Square, Melbourne VIC","10 Smith St, Brunswick VIC",OFFICE,2025,2025-04-18,2025-04-21
+E002,"123 Collins St, Melbourne VIC","42 Hutchinson St, Brunswick East VIC",HOME,2025,,
+"""
+
+# Result rows kept in memory for the on-page table; the CSV has every row
+PREVIEW_ROWS = 200
+
+# Batch results are tuples in RESULT_COLUMNS order (the findings columns the
+# report reads, as run.py writes them): per-row fields, lookup-derived fields, error
+ROW_FIELDS = ("row", "employee_id", "work_mode", "input_address")
+LOOKUP_FIELDS = tuple(f for f in FINDING_FIELDS if f not in ROW_FIELDS)
+RESULT_COLUMNS = ROW_FIELDS + LOOKUP_FIELDS + ("error",)
+_NO_LOOKUP = (None,) * len(LOOKUP_FIELDS)
+_get_lookup_fields = itemgetter(*LOOKUP_FIELDS)
+
+
+class _TransientLookupResult(Exception):
+    """Carries a failed lookup out of _cached_lookup so st.cache_data doesn't keep it."""
+
+    def __init__(self, result):
+        super().__init__(result.get("audit_message"))
+        self.result = result
+
+
+@st.cache_data(show_spinner=False, ttl=60 * 60 * 24, max_entries=10_000)
+def _cached_lookup(address_key, year, start, end, _address):
+    # Cached on the normalised address; `_address` (unhashed) is what gets geocoded.
+    # Imported on first use: the service loads the geo stack (geopandas/shapely),
+    # which the page shouldn't wait for before it can render.
+    from src.address_holidays import service
+
+    r = service.lookup_address_info(_address, year, start=start, end=end)
+    # Upstream outages / errors come back as a result dict rather than raising;
+    # raise them past the cache so the next run retries instead of replaying them
+    if r.get("status") in (service.STATUS_ERROR, service.STATUS_UPSTREAM_UNAVAILABLE):
+        raise _TransientLookupResult(r)
+    return r
+
+
+def cached_lookup(address, year, start=None, end=None):
+    """
+    lookup_address_info() cached across reruns and rows (address compared case/space-insensitively).
+    Only successful / NOT_FOUND results are cached; ERROR and UPSTREAM_UNAVAILABLE are returned uncached.
+    """
+    address = address.strip()
+    try:
+        return _cached_lookup(" ".join(address.lower().split()), year, start, end, address)
+    except _TransientLookupResult as e:
+        return e.result
+
+
+# Batch CSV columns the app reads, with dtypes fixed up front instead of inferred
+BATCH_CSV_DTYPES = {
+    "employee_id": "string",
+    "office_address": "string",
+    "home_address": "string",
+    "work_mode": "string",
+    "year": "Int64",
+    "start_date": "string",
+    "end_date": "string",
+}
+
+
+# Opt-in (PH_FAST_CSV=1): parse uploads with pandas' multi-threaded pyarrow engine
+# when pyarrow is installed. Off by default so parsing stays exactly as before.
+FAST_CSV = os.getenv("PH_FAST_CSV") == "1" and importlib.util.find_spec("pyarrow") is not None
+
+
+def read_batch_csv(uploaded):
+    """Read the uploaded batch CSV (known columns only); falls back to inference if they don't fit."""
+    try:
+        if FAST_CSV:
+            # The pyarrow engine doesn't take a callable usecols; select afterwards
+            df = pd.read_csv(uploaded, engine="pyarrow", dtype=BATCH_CSV_DTYPES)
+            return df[[c for c in df.columns if c in BATCH_CSV_DTYPES]]
+        return pd.read_csv(uploaded, usecols=lambda c: c in BATCH_CSV_DTYPES, dtype=BATCH_CSV_DTYPES)
+    except (ValueError, TypeError):
+        # e.g. a non-numeric year: keep the old behaviour and let row handling deal with it
+        uploaded.seek(0)
+        return pd.read_csv(uploaded)
+
+
+def _to_date(value):
+    return pd.to_datetime(value).date() if pd.notna(value) and str(value).strip() else None
+
+
+def prepare_batch_rows(df, default_year, default_start, default_end):
+    """
+    Column-wise work_mode/address/year/date coercion for the uploaded CSV.
+
+    Returns one (idx, employee_id, work_mode, address, year, start, end) tuple per
+    row, address already stripped. Defaults apply only when the column is absent from the CSV. year/start/end
+    are only coerced for rows that will actually be looked up.
+    """
+    def col(name, default):
+        if name in df.columns:
+            return df[name]
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+    work_mode = df["work_mode"].astype(str).str.upper().str.strip()
+    # Stripped once here; everything downstream uses the stripped address
+    address = col("office_address", "").where(
+        work_mode == "OFFICE", col("home_address", "").where(work_mode == "HOME")
+    ).map(lambda a: a.strip() if isinstance(a, str) else a)
+    valid = work_mode.isin(("OFFICE", "HOME")) & address.map(lambda a: isinstance(a, str) and a != "")
+
+    # Row overrides (optional), coerced for looked-up rows only
+    valid_rows = valid.tolist()
+
+    def spread(values):
+        # Back to one entry per row; rejected rows get None
+        it = iter(values)
+        return [next(it) if v else None for v in valid_rows]
+
+    years = spread(col("year", default_year)[valid].fillna(default_year).astype(int).tolist())
+
+    # Pay periods repeat across rows: parse each distinct value once
+    def dates(name, default):
+        values = col(name, default)[valid]
+        parsed = {v: _to_date(v) for v in values.dropna().unique()}
+        return spread([parsed[v] if pd.notna(v) else None for v in values])
+
+    return zip(
+        df.index,
+        # NaN/<NA> ids become None so the CSV writer leaves the cell blank
+        col("employee_id", None).astype(object).where(lambda c: c.notna(), None).tolist(),
+        work_mode.tolist(),
+        address.tolist(),
+        years,
+        dates("start_date", default_start),
+        dates("end_date", default_end),
+    )
+
+
+def batch_row_error(idx, employee_id, work_mode, address):
+    """Result for a row that can't be looked up (bad work_mode / no address), else None."""
+    if work_mode not in ("OFFICE", "HOME"):
+        return (idx, employee_id, None, None, *_NO_LOOKUP, "Invalid work_mode (must be OFFICE or HOME)")
+
+    if not isinstance(address, str) or not address:
+        return (idx, employee_id, work_mode, None, *_NO_LOOKUP, "Missing address for work_mode")
+
+    return None
+
+
+def lookup_fields(address, year, start, end, timings=None):
+    """
+    LOOKUP_FIELDS values for one (address, year, pay period); runs on a worker thread, so no st.* calls here.
+    If `timings` is given, the lookup's wall time in seconds is appended to it.
+    """
+    t0 = time.perf_counter()
+    r = cached_lookup(address, year, start=start, end=end)
+    if timings is not None:
+        timings.append(time.perf_counter() - t0)
+
+    holidays_in_period = r.get("holidays_in_period") or []
+    pay_period = r.get("pay_period") or {}
+
+    # Map date -> name (first name wins if duplicates), reading each date once;
+    # the keys are then the unique dates, sorted once with names aligned to them
+    names_by_date = {}
+    for h in holidays_in_period:
+        d = h.get("date")
+        if d and d not in names_by_date:
+            names_by_date[d] = h.get("name") or h.get("localName", "") or ""
+
+    dates = sorted(names_by_date)
+    names = [names_by_date[d] for d in dates]
+    return _get_lookup_fields({
+        "formatted_address": r.get("formatted_address", ""),
+        "state": r.get("state"),
+        "postcode": r.get("postcode"),
+        "locality": r.get("locality"),   # nice to include now
+        "lga": r.get("lga"),
+        "pay_period_start": pay_period.get("start") or "",
+        "pay_period_end": pay_period.get("end") or "",
+        "holiday_count_in_period": r.get("holiday_count_in_period"),
+        "holiday_dates_in_period": "; ".join(dates),
+        "holiday_names_in_period": "; ".join(names),
+        "status": r.get("status"),
+        "manual_review": r.get("manual_review"),
+        "confidence": r.get("confidence"),
+        "audit_message": r.get("audit_message"),
+        "geocode_quality": r.get("geocode_quality") or r.get("location_type"),
+        "lga_resolution_method": r.get("lga_resolution_method"),
+        "rules_applied": "; ".join(r.get("rules_applied", [])),
+        "replacement_applied": r.get("replacement_applied"),
+    })
+
+
+def latency_summary(timings):
+    """p50/p95 of per-lookup wall times (seconds) as a caption line, or None if nothing was looked up."""
+    if not timings:
+        return None
+    p50 = statistics.median(timings)
+    p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else p50
+    return f"Lookup latency over {len(timings)} lookup(s): p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms"
+
+
+def batch_row_result(idx, employee_id, work_mode, address, fut):
+    """Result for a looked-up row from its (possibly shared) lookup_fields future."""
+    try:
+        return (idx, employee_id, work_mode, address, *fut.result(), None)
+    except Exception as e:
+        return (idx, employee_id, work_mode, address, *_NO_LOOKUP, str(e))
+
+
+def write_ready_rows(writer, results, next_pos):
+    """
+    Write the finished results from next_pos onwards (stopping at the first
+    unfinished row, so the CSV stays in input order); returns the new next_pos.
+    Rows past the preview are dropped from memory once written.
+    """
+    while next_pos < len(results) and results[next_pos] is not None:
+        writer.writerow(results[next_pos])
+        if next_pos >= PREVIEW_ROWS:
+            results[next_pos] = None
+        next_pos += 1
+    return next_pos
+
 
 st.set_page_config(page_title="AU Address → LGA + Public Holidays", page_icon="🗺️", layout="wide")
 
@@ -20,7 +251,7 @@ st.caption(
 
 office_address = st.text_input("Office address", placeholder="e.g. 123 Collins St, Melbourne VIC")
 home_address = st.text_input("Home address", placeholder="e.g. 10 Smith St, Brunswick VIC")
-year = st.selectbox("Year", options=[2024, 2025, 2026, 2027], index=1)
+year = st.selectbox("Year", options=YEAR_OPTIONS, index=1)
 
 show_debug = st.toggle("🔎 Show debug (state/locality/LGA/postcode)", value=False)
 
@@ -43,7 +274,7 @@ if st.button("Lookup", type="primary"):
 
         if office_address.strip():
             try:
-                office_result = lookup_address_info(office_address, int(year))
+                office_result = cached_lookup(office_address, int(year))
             except Exception as e:
                 msg = str(e)
                 if "Address not found" in msg or "ZERO_RESULTS" in msg:
@@ -57,7 +288,7 @@ if st.button("Lookup", type="primary"):
 
         if home_address.strip():
             try:
-                home_result = lookup_address_info(home_address, int(year))
+                home_result = cached_lookup(home_address, int(year))
             except Exception as e:
                 msg = str(e)
                 if "Address not found" in msg or "ZERO_RESULTS" in msg:
@@ -107,15 +338,12 @@ if st.button("Lookup", type="primary"):
 
             # 🔎 Debug block (Office)
             if show_debug:
-                st.code(
-                    {
-                        "state": office_result.get("state"),
-                        "postcode": office_result.get("postcode"),
-                        "locality": office_result.get("locality"),
-                        "lga": office_result.get("lga"),
-                    },
-                    language="json",
-                )
+                st.json({
+                    "state": office_result.get("state"),
+                    "postcode": office_result.get("postcode"),
+                    "locality": office_result.get("locality"),
+                    "lga": office_result.get("lga"),
+                })
             st.dataframe(office_result.get("holidays", []), use_container_width=True)
         else:
             st.info("No office address provided.")
@@ -159,15 +387,12 @@ if st.button("Lookup", type="primary"):
 
             # 🔎 Debug block (ADD THIS)
             if show_debug:
-                st.code(
-                    {
-                        "state": home_result.get("state"),
-                        "postcode": home_result.get("postcode"),
-                        "locality": home_result.get("locality"),
-                        "lga": home_result.get("lga"),
-                    },
-                    language="json",
-                )
+                st.json({
+                    "state": home_result.get("state"),
+                    "postcode": home_result.get("postcode"),
+                    "locality": home_result.get("locality"),
+                    "lga": home_result.get("lga"),
+                })
 
             st.dataframe(home_result.get("holidays", []), use_container_width=True)
         else:
@@ -178,14 +403,9 @@ if st.button("Lookup", type="primary"):
 st.divider()
 st.header("📦 Batch payroll check (CSV)")
 
-template_csv = """employee_id,office_address,home_address,work_mode,year,start_date,end_date
-E001,"Federation Square, Melbourne VIC","10 Smith St, Brunswick VIC",OFFICE,2025,2025-04-18,2025-04-21
-E002,"123 Collins St, Melbourne VIC","42 Hutchinson St, Brunswick East VIC",HOME,2025,,
-"""
-
 st.download_button(
     "⬇️ Download batch CSV template",
-    data=template_csv,
+    data=TEMPLATE_CSV_BYTES,
     file_name="batch_template.csv",
     mime="text/csv",
 )
@@ -203,7 +423,7 @@ else:
 
 default_year = st.selectbox(
     "Default year (used only if missing in CSV)",
-    options=[2024, 2025, 2026, 2027],
+    options=YEAR_OPTIONS,
     index=1,
 )
 
@@ -222,103 +442,63 @@ st.caption(
 )
 
 if uploaded:
-    df = pd.read_csv(uploaded)
+    df = read_batch_csv(uploaded)
 
     if "work_mode" not in df.columns:
         st.error("CSV must include a 'work_mode' column with OFFICE or HOME.")
         st.stop()
 
-    results = []
-
-    with st.spinner("Processing rows…"):
-        for idx, row in df.iterrows():
-            employee_id = row.get("employee_id", None)
-            work_mode = str(row.get("work_mode", "")).upper().strip()
-
-            if work_mode == "OFFICE":
-                address = row.get("office_address", "")
-            elif work_mode == "HOME":
-                address = row.get("home_address", "")
-            else:
-                results.append({"row": idx, "employee_id": employee_id, "error": "Invalid work_mode (must be OFFICE or HOME)"})
+    # Lookups are network-bound (geocoding + holidays), so rows run concurrently
+    items = list(prepare_batch_rows(df, default_year, default_start, default_end))
+    results = [None] * len(items)
+
+    # Results CSV is written as rows finish (in input order), same columns as run.py
+    csv_buf = io.StringIO()
+    writer = csv.writer(csv_buf, lineterminator="\n")
+    writer.writerow(RESULT_COLUMNS)
+    next_pos = 0
+
+    # Rows sharing an (address, year, pay period) key share one lookup
+    key_futures = {}
+    # Per-lookup wall times (list.append is safe from the worker threads)
+    lookup_timings = []
+    rows_by_future = {}
+    done = 0
+
+    progress = st.progress(0.0, text="Processing rows…")
+    with ThreadPoolExecutor(max_workers=min(32, max(4, len(items) // 4))) as ex:
+        for pos, (idx, employee_id, work_mode, address, year, start, end) in enumerate(items):
+            error = batch_row_error(idx, employee_id, work_mode, address)
+            if error is not None:
+                results[pos] = error
+                done += 1
                 continue
 
-            if not isinstance(address, str) or not address.strip():
-                results.append({"row": idx, "employee_id": employee_id, "work_mode": work_mode, "error": "Missing address for work_mode"})
-                continue
-
-            # Row overrides (optional)
-            year = row.get("year", default_year)
-            year = int(year) if pd.notna(year) else int(default_year)
-
-            start = row.get("start_date", default_start)
-            end = row.get("end_date", default_end)
-
-            start = pd.to_datetime(start).date() if pd.notna(start) and str(start).strip() else None
-            end = pd.to_datetime(end).date() if pd.notna(end) and str(end).strip() else None
-
-            try:
-                r = lookup_address_info(address.strip(), year, start=start, end=end)
-
-                holidays_in_period = r.get("holidays_in_period") or []
-                pay_period = r.get("pay_period") or {}
-
-                # Build a sorted list of unique holiday dates
-                dates = sorted({h.get("date") for h in holidays_in_period if h.get("date")})
-
-                # Map date -> name (first name wins if duplicates)
-                names_by_date = {}
-                for h in holidays_in_period:
-                    d = h.get("date")
-                    if not d:
-                        continue
-                    n = h.get("name") or h.get("localName", "") or ""
-                    names_by_date.setdefault(d, n)
-
-                # Names aligned to the sorted dates list
-                names = [names_by_date.get(d, "") for d in dates]
-                results.append({
-                    "row": idx,
-                    "employee_id": employee_id,
-                    "work_mode": work_mode,
-                    "input_address": address.strip(),
-
-                    "formatted_address": r.get("formatted_address", ""),
-                    "state": r.get("state"),
-                    "postcode": r.get("postcode"),
-                    "locality": r.get("locality"),   # nice to include now
-                    "lga": r.get("lga"),
-                    "pay_period_start": pay_period.get("start") or "",
-                    "pay_period_end": pay_period.get("end") or "",
-                    "holiday_count_in_period": r.get("holiday_count_in_period"),
-                    "holiday_dates_in_period": "; ".join(dates),
-                    "holiday_names_in_period": "; ".join(names),
-                    "status": r.get("status"),
-                    "manual_review": r.get("manual_review"),
-                    "confidence": r.get("confidence"),
-                    "audit_message": r.get("audit_message"),
-                    "geocode_quality": r.get("geocode_quality") or r.get("location_type"),
-                    "lga_resolution_method": r.get("lga_resolution_method"),
-                    "rules_applied": "; ".join(r.get("rules_applied", [])),
-                    "replacement_applied": r.get("replacement_applied"),
-                })
-            except Exception as e:
-                results.append({
-                    "row": idx,
-                    "employee_id": employee_id,
-                    "work_mode": work_mode,
-                    "input_address": address.strip(),
-                    "error": str(e),
-                })
-
-    out_df = pd.DataFrame(results)
+            key = (" ".join(address.lower().split()), year, start, end)
+            fut = key_futures.get(key)
+            if fut is None:
+                fut = key_futures[key] = ex.submit(lookup_fields, address, year, start, end, lookup_timings)
+                rows_by_future[fut] = []
+            rows_by_future[fut].append(pos)
+
+        next_pos = write_ready_rows(writer, results, next_pos)
+        for fut in as_completed(rows_by_future):
+            for pos in rows_by_future[fut]:
+                results[pos] = batch_row_result(*items[pos][:4], fut)
+            done += len(rows_by_future[fut])
+            next_pos = write_ready_rows(writer, results, next_pos)
+            progress.progress(done / len(items), text=f"Processed {done}/{len(items)} rows")
+    progress.empty()
+
+    results_csv = csv_buf.getvalue()
+    del csv_buf  # results_csv now holds the only copy
 
     # Choose / reuse your output directory
     output_dir = Path("outputs") / "public_holiday_run"
     output_dir.mkdir(parents=True, exist_ok=True)
 
     results_csv_path = output_dir / "payroll_holiday_check_results.csv"
-    out_df.to_csv(results_csv_path, index=False)
+    results_csv_path.write_text(results_csv, encoding="utf-8")
 
     report_md_path = generate_public_holiday_report(
         findings_csv=results_csv_path,
@@ -334,11 +514,17 @@ if uploaded:
 
 
 
-    st.dataframe(out_df, use_container_width=True)
+    st.dataframe(pd.DataFrame(results[:PREVIEW_ROWS], columns=RESULT_COLUMNS), use_container_width=True)
+    if len(results) > PREVIEW_ROWS:
+        st.caption(f"Showing the first {PREVIEW_ROWS} of {len(results)} rows; download the CSV for all results.")
+
+    latency = latency_summary(lookup_timings)
+    if latency:
+        st.caption(latency)
 
     st.download_button(
         "⬇️ Download results CSV",
-        data=out_df.to_csv(index=False),
+        data=results_csv,
         file_name="payroll_holiday_check_results.csv",
         mime="text/csv",
     )
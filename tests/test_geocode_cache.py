@@ -0,0 +1,65 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.address_holidays import geocode_cache
+
+GEO = {
+    "formatted_address": "Federation Square, Melbourne VIC 3000",
+    "lat": -37.818,
+    "lon": 144.969,
+    "state": "VIC",
+    "postcode": "3000",
+    "locality": "Melbourne",
+}
+KEY = "v3|federation square, melbourne vic"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(geocode_cache, "DB_PATH", tmp_path / "geocode_cache.db")
+    monkeypatch.setattr(geocode_cache, "CACHE_TTL_DAYS", 30)
+    geocode_cache._memo_discard()
+    yield geocode_cache
+    geocode_cache._memo_discard()
+    geocode_cache.close_connections()
+
+
+def _age_row(cache, days):
+    with sqlite3.connect(cache.DB_PATH) as conn:
+        conn.execute(
+            "UPDATE geocode_cache SET created_at = datetime('now', ?)",
+            (f"-{days} days",),
+        )
+
+
+def test_fresh_row_is_returned(cache):
+    cache.set_cached(KEY, GEO)
+
+    assert cache.get_cached(KEY) == GEO
+    # Second read is served from the in-process memo
+    assert KEY in cache._MEMO
+    assert cache.get_cached(KEY) == GEO
+
+
+def test_expired_row_is_a_miss(cache):
+    cache.set_cached(KEY, GEO)
+    _age_row(cache, 31)
+
+    assert cache.get_cached(KEY) is None
+    assert KEY not in cache._MEMO
+
+
+def test_memoised_row_expires_with_ttl(cache, monkeypatch):
+    cache.set_cached(KEY, GEO)
+    assert cache.get_cached(KEY) == GEO  # now memoised
+    assert KEY in cache._MEMO
+
+    # 31 days later: the memo entry and the stored row are both past the TTL
+    _age_row(cache, 31)
+    now = time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 31 * 86400)
+
+    assert cache.get_cached(KEY) is None
+    assert KEY not in cache._MEMO
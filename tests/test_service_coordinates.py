@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("geopandas")
+pytest.importorskip("dotenv")
+pytest.importorskip("requests")
+
+from src.address_holidays import service
+from src.address_holidays.regional_rules import RegionalHolidayRule, build_rule_index
+
+NEW_YEAR = {
+    "date": "2025-01-01",
+    "name": "New Year's Day",
+    "scope": "FULL_DAY",
+    "is_regional": False,
+    "source": "Nager.Date",
+    "applies_to": "ALL",
+}
+
+RACE_DAY = RegionalHolidayRule(
+    date(2025, 8, 21), "NSW Race Day", "NSW", "LOCALITY", "Albury", "FULL_DAY", "ALL", "test", ""
+)
+VETERANS_DAY = RegionalHolidayRule(
+    date(2025, 8, 25), "Albury LGA Veteran's Day", "NSW", "LGA", "Albury", "FULL_DAY", "ALL", "test", ""
+)
+
+
+@pytest.fixture
+def albury(monkeypatch):
+    """Albury resolves from either input style; Nager.Date and the rules file are stubbed."""
+    def use_rules(*rules):
+        index = build_rule_index(rules)
+        monkeypatch.setattr(service, "load_regional_rule_index", lambda year: index)
+
+    monkeypatch.setattr(service, "_base_holidays_for_state", lambda year, state: (NEW_YEAR,))
+    monkeypatch.setattr(service, "lga_and_state_from_latlon", lambda lat, lon: ("Albury", "NSW"))
+    monkeypatch.setattr(service, "lga_from_latlon", lambda lat, lon: "Albury")
+    monkeypatch.setattr(
+        service,
+        "geocode_address",
+        lambda address: {
+            "formatted_address": "Dean St, Albury NSW 2640",
+            "lat": -36.08,
+            "lon": 146.91,
+            "state": "NSW",
+            "postcode": "2640",
+            "locality": "Albury",
+            "location_type": "ROOFTOP",
+        },
+    )
+    return use_rules
+
+
+def _names(result):
+    return [h["name"] for h in result["holidays"]]
+
+
+def test_geocoded_address_matches_locality_rule(albury):
+    albury(RACE_DAY, VETERANS_DAY)
+
+    r = service.lookup_address_info("Dean St, Albury NSW", 2025)
+
+    assert r["status"] == service.STATUS_OK
+    assert "NSW Race Day" in _names(r)
+    assert "Albury LGA Veteran's Day" in _names(r)
+
+
+def test_coordinates_flag_unevaluated_locality_rules(albury):
+    albury(RACE_DAY, VETERANS_DAY)
+
+    r = service.lookup_address_info("-36.08, 146.91", 2025)
+
+    # The LGA rule still applies; the LOCALITY rule can't, so the row goes to review
+    assert r["lga"] == "Albury"
+    assert "Albury LGA Veteran's Day" in _names(r)
+    assert "NSW Race Day" not in _names(r)
+    assert r["status"] == service.STATUS_LOW_CONFIDENCE
+    assert r["manual_review"] is True
+    assert r["confidence"] <= service.COORDINATES_UNMATCHED_RULES_CONFIDENCE
+    assert "LGA-keyed" in r["audit_message"]
+
+
+def test_coordinates_ok_when_state_has_only_lga_rules(albury):
+    albury(VETERANS_DAY)
+
+    r = service.lookup_address_info("-36.08, 146.91", 2025)
+
+    assert r["status"] == service.STATUS_OK
+    assert r["confidence"] == 1.0
+    assert "Albury LGA Veteran's Day" in _names(r)